@@ -1,14 +1,123 @@
+import json
+
 import numpy as np
-from sklearn.linear_model import LinearRegression
+
+BASE_FEATURES = ['lstm_pred', 'sentiment_score']
+
 
 class FusionModel:
-    def __init__(self):
-        self.model = LinearRegression()
+    # Linear fusion of the LSTM price and the sentiment score (plus optional extra features such
+    # as article_count or the daily/weekly/monthly directions), fitted from sufficient statistics:
+    # weighted means and co-moments of the features and the target. train() gives the same
+    # coefficients as LinearRegression; update() folds in new days without a refit, at a cost
+    # that depends only on the number of features. decay < 1 down-weights older days
+    # (exponentially weighted least squares); ridge > 0 adds an L2 penalty on the weights.
+    def __init__(self, extra_features=(), decay=1.0, ridge=0.0):
+        self.feature_names = BASE_FEATURES + list(extra_features)
+        self.decay = decay
+        self.ridge = ridge
+        self.reset()
+
+    def reset(self):
+        k = len(self.feature_names)
+        self.n = 0.0
+        self.mean_x = np.zeros(k)
+        self.mean_y = 0.0
+        self.cxx = np.zeros((k, k))
+        self.cxy = np.zeros(k)
+        self._solution = None
+
+    def _design(self, lstm_preds, sentiment_scores, extra):
+        missing = [f for f in self.feature_names[2:] if f not in extra]
+        if missing:
+            raise ValueError(f"Missing fusion features: {missing}")
+        columns = [lstm_preds, sentiment_scores] + [extra[f] for f in self.feature_names[2:]]
+        return np.column_stack([np.atleast_1d(np.asarray(c, dtype=float)) for c in columns])
+
+    def update(self, lstm_preds, sentiment_scores, true_prices, **extra):
+        # Scalars (one new day) or arrays (a batch); batches are merged with the pairwise
+        # mean/co-moment update, so the result does not depend on how the days are split
+        X = self._design(lstm_preds, sentiment_scores, extra)
+        y = np.atleast_1d(np.asarray(true_prices, dtype=float))
+        if len(X) != len(y):
+            raise ValueError("Features and true_prices differ in length")
+        if len(y) == 0:
+            return self
+        if self.decay != 1.0:
+            # Row i of the batch is len(y)-1-i days older than the newest one
+            w = self.decay ** np.arange(len(y) - 1, -1, -1, dtype=float)
+            old_weight = self.decay ** len(y)
+        else:
+            w = np.ones(len(y))
+            old_weight = 1.0
+
+        nb = w.sum()
+        mean_xb = w @ X / nb
+        mean_yb = w @ y / nb
+        Xc, yc = X - mean_xb, y - mean_yb
+        cxx_b = (Xc * w[:, None]).T @ Xc
+        cxy_b = (Xc * w[:, None]).T @ yc
+
+        na = self.n * old_weight
+        n = na + nb
+        dx, dy = mean_xb - self.mean_x, mean_yb - self.mean_y
+        self.cxx = self.cxx * old_weight + cxx_b + np.outer(dx, dx) * na * nb / n
+        self.cxy = self.cxy * old_weight + cxy_b + dx * dy * na * nb / n
+        self.mean_x = self.mean_x + dx * nb / n
+        self.mean_y = self.mean_y + dy * nb / n
+        self.n = n
+        self._solution = None
+        return self
+
+    def train(self, lstm_preds, sentiment_scores, true_prices, **extra):
+        # Full fit from scratch, as before
+        self.reset()
+        return self.update(lstm_preds, sentiment_scores, true_prices, **extra)
+
+    def _solve(self):
+        if self._solution is None:
+            if self.n == 0:
+                raise ValueError("FusionModel has not been trained")
+            a = self.cxx + self.ridge * np.eye(len(self.cxy))
+            # lstsq: minimum-norm weights when a feature is constant, like LinearRegression
+            coef = np.linalg.lstsq(a, self.cxy, rcond=None)[0]
+            self._solution = (coef, self.mean_y - self.mean_x @ coef)
+        return self._solution
+
+    @property
+    def coef_(self):
+        return self._solve()[0]
+
+    @property
+    def intercept_(self):
+        return self._solve()[1]
+
+    def predict(self, lstm_pred, sentiment_score, **extra):
+        # Scalars give a float, arrays a vector of predictions
+        coef, intercept = self._solve()
+        y = self._design(lstm_pred, sentiment_score, extra) @ coef + intercept
+        return float(y[0]) if np.ndim(lstm_pred) == 0 else y
+
+    def state_dict(self):
+        return {'feature_names': self.feature_names, 'decay': self.decay, 'ridge': self.ridge, 'n': self.n,
+                'mean_x': self.mean_x.tolist(), 'mean_y': self.mean_y,
+                'cxx': self.cxx.tolist(), 'cxy': self.cxy.tolist()}
+
+    @classmethod
+    def from_state_dict(cls, state):
+        model = cls(state['feature_names'][2:], state['decay'], state['ridge'])
+        model.n = state['n']
+        model.mean_x = np.array(state['mean_x'], dtype=float)
+        model.mean_y = state['mean_y']
+        model.cxx = np.array(state['cxx'], dtype=float)
+        model.cxy = np.array(state['cxy'], dtype=float)
+        return model
 
-    def train(self, lstm_preds, sentiment_scores, true_prices):
-        X = np.column_stack([lstm_preds, sentiment_scores])
-        y = np.array(true_prices)
-        self.model.fit(X, y)
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.state_dict(), f, indent=2)
 
-    def predict(self, lstm_pred, sentiment_score):
-        return self.model.predict([[lstm_pred, sentiment_score]])[0]
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_state_dict(json.load(f))
@@ -1,47 +1,72 @@
-import yfinance as yf
 import pandas as pd
-from datetime import timedelta
-from Numerical_Analysis.lstm_model import predict_price
-from News_Analysis.newsapi_fetch_news import fetch_news
-from News_Analysis.news_filter import filter_news
-from News_Analysis.sentiment_analysis import apply_sentiment
+from Fusion_Model import lstm_model
+from Fusion_Model.newsapi_fetch_news import NewsApiClient
+from Fusion_Model.news_filter import filter_news
+from Fusion_Model.sentiment_analysis import apply_sentiment
+from Pipeline.market_data import get_prices
+from Pipeline.profiling import stage
+from Pipeline.sentiment_store import SentimentStore, article_ids
 
+FUSION_SENTIMENT_DB_PATH = "data/fusion_sentiment.sqlite"  # VADER compounds, kept apart from the FinBERT store
 
-def get_ndx_prices(start_date, end_date):
-    df = yf.download("^NDX", start=start_date, end=end_date)
+
+def get_ndx_prices(start_date, end_date, store=None):
+    df = get_prices("^NDX", start_date, end_date, store=store)
     df = df.reset_index()  # Ensure 'Date' is a column
     df["date"] = pd.to_datetime(df["Date"]) 
     return df[["date", "Close"]].rename(columns={"Close": "true_price"})
 
 
 def generate_lstm_predictions(start_date, end_date):
-    dates = pd.date_range(start_date, end_date, freq="B")
-    predictions = []
-    for date in dates:
-        try:
-            pred = predict_price(date.strftime("%Y-%m-%d"))
-            predictions.append((date, pred))
-        except:
-            predictions.append((date.date(), None))
-    return pd.DataFrame(predictions, columns=["date", "lstm_pred"])
-
-def collect_sentiment_series(start_date, end_date, api_key):
-    sentiment_data = []
-    current = pd.to_datetime(start_date)
-    end = pd.to_datetime(end_date)
-    while current <= end:
-        date_str = current.strftime("%Y-%m-%d")
-        news = fetch_news(from_date=date_str, to_date=date_str, api_key=api_key)
-        if not news.empty:
-            news = filter_news(news)
-            news = apply_sentiment(news)
-            avg_sentiment = news["sentiment_score"].mean()
-            sentiment_data.append((current, avg_sentiment))
-        else:
-            sentiment_data.append((current.date(), 0))
-        current += timedelta(days=1)
-    return pd.DataFrame(sentiment_data, columns=["date", "sentiment_score"])
+    return lstm_model.generate_lstm_predictions(start_date, end_date, lstm_model)
+
+def upsert_scored_news(news, store, backend=None):
+    # news: articles with a 'day' column; they are scored with `backend` unless they already
+    # carry a 'sentiment' (and optionally 'score') column. Returns how many were new or changed.
+    if news.empty:
+        return 0
+    if 'sentiment' not in news.columns:
+        if 'combined_text' not in news.columns:
+            news = news.assign(combined_text=news['title'].fillna("") + " " + news['description'].fillna(""))
+        with stage("sentiment", items=len(news), unit="articles"):
+            news = apply_sentiment(news, backend=backend)
+        news = news.assign(sentiment=news['sentiment_score'])
+    with stage("sentiment_store", items=len(news), unit="articles"):
+        articles = pd.DataFrame({'article_id': article_ids(news), 'date': news['day'].to_numpy(),
+                                 'sentiment': news['sentiment'].to_numpy()})
+        if 'score' in news.columns:
+            articles['score'] = news['score'].to_numpy()
+        return store.upsert_articles(articles)
+
+
+def ingest_news(start_date, end_date, api_key, store, client=None, backend=None):
+    # Fetch, filter and score every day of [start_date, end_date] into `store`
+    client = client or NewsApiClient(api_key=api_key)
+    days = pd.date_range(pd.to_datetime(start_date), pd.to_datetime(end_date), freq="D")
+    with stage("news_fetch", unit="articles") as record:
+        news_by_day = client.fetch_days(days)
+        frames = []
+        for current in days:
+            news = news_by_day[current.strftime("%Y-%m-%d")]
+            if not news.empty:
+                frames.append(news.assign(day=current))
+        record['items'] = sum(len(f) for f in frames)
+
+    if not frames:
+        return days, 0
+    news = pd.concat(frames, ignore_index=True)
+    with stage("news_filter", items=len(news), unit="articles"):
+        news = filter_news(news)
+    return days, upsert_scored_news(news, store, backend)
+
 
+def collect_sentiment_series(start_date, end_date, api_key, client=None, store=None):
+    # Scored articles are upserted into the sentiment store by id; the series is a range read
+    # of its daily means, so re-running a window only scores and writes what changed
+    store = store or SentimentStore(FUSION_SENTIMENT_DB_PATH)
+    days, _ = ingest_news(start_date, end_date, api_key, store, client)
+    daily = store.daily(days[0], days[-1]).set_index('Date')['avg_sentiment']
+    return pd.DataFrame({"date": days, "sentiment_score": daily.reindex(days, fill_value=0).to_numpy()})
 
 
 def build_fusion_training_data(prices_df, lstm_df, sentiment_df):
@@ -62,7 +87,8 @@ def build_fusion_training_data(prices_df, lstm_df, sentiment_df):
     df = df.merge(sentiment_df, on="date", how="left")
     df = df.dropna()
 
-    return df["lstm_pred"].tolist(), df["sentiment_score"].tolist(), df["true_price_^NDX"].tolist()
+    price_col = "true_price" if "true_price" in df.columns else "true_price_^NDX"
+    return df["lstm_pred"].tolist(), df["sentiment_score"].tolist(), df[price_col].tolist()
 
 
 
@@ -1,45 +1,85 @@
 import numpy as np
 import pandas as pd
 from datetime import timedelta
-from tensorflow.keras.models import load_model
-import joblib
-import yfinance as yf
+from numpy.lib.stride_tricks import sliding_window_view
+from Pipeline.market_data import get_prices
 
-# Load once
-model = load_model("Numerical_Analysis/ndx_lstm.h5")
-scaler = joblib.load("Numerical_Analysis/scaler.save")
+MODEL_PATH = "Numerical_Analysis/ndx_lstm.h5"
+SCALER_PATH = "Numerical_Analysis/scaler.save"
+_model = None
+_scaler = None
 
-def get_processed_data(end_date, lookback=60):
+def get_model():
+    # Loaded on first use, then kept for the life of the process
+    global _model
+    if _model is None:
+        from tensorflow.keras.models import load_model
+        _model = load_model(MODEL_PATH)
+    return _model
+
+def get_scaler():
+    global _scaler
+    if _scaler is None:
+        import joblib
+        _scaler = joblib.load(SCALER_PATH)
+    return _scaler
+
+def get_processed_data(end_date, lookback=60, store=None):
     ticker = "^NDX"
     end_date = pd.to_datetime(end_date)
     start_date = end_date - timedelta(days=lookback * 2)
 
-    data = yf.download(ticker, start=start_date.strftime('%Y-%m-%d'), end=(end_date + timedelta(days=1)).strftime('%Y-%m-%d'))
+    data = get_prices(ticker, start_date, end_date + timedelta(days=1), store=store)
     close_data = data['Close']
 
     if len(close_data) < lookback:
         raise ValueError("Not enough data to make prediction")
 
     close_data = close_data[-lookback:]  # Last 60 days
-    scaled_data = scaler.transform(close_data.values.reshape(-1, 1))
+    scaled_data = get_scaler().transform(close_data.values.reshape(-1, 1))
     X_input = np.reshape(scaled_data, (1, lookback, 1))
     return X_input
 
 def predict_price(date_str):
     X_input = get_processed_data(date_str)
-    scaled_pred = model.predict(X_input)
-    actual_pred = scaler.inverse_transform(scaled_pred)
+    scaled_pred = get_model().predict(X_input)
+    actual_pred = get_scaler().inverse_transform(scaled_pred)
     return float(actual_pred[0][0])
 
-def generate_lstm_predictions(start_date, end_date, lstm_model):
-    dates = pd.date_range(start_date, end_date, freq="B")  # business days
-    predictions = []
+def predict_prices(dates, lookback=60, store=None):
+    # Batched predict_price: one price load, one vectorized windowing pass, one model call
+    dates = pd.DatetimeIndex(pd.to_datetime(dates)).normalize()
+    result = pd.DataFrame({"date": dates, "lstm_pred": np.nan, "error": None})
+    if len(dates) == 0:
+        return result
 
-    for date in dates:
-        try:
-            pred = lstm_model.predict_price(date.strftime("%Y-%m-%d"))
-            predictions.append((date.date(), pred))
-        except:
-            predictions.append((date.date(), None))
+    data = get_prices("^NDX", dates.min() - timedelta(days=lookback * 2), dates.max() + timedelta(days=1), store=store)
+    close = np.asarray(data["Close"], dtype=float).ravel()
+    index = data.index.normalize()
 
-    return pd.DataFrame(predictions, columns=["date", "lstm_pred"])
+    # Same rule as get_processed_data: the last `lookback` closes on or before the date,
+    # all within the preceding lookback*2 calendar days
+    stop = index.searchsorted(dates, side="right")
+    first = index.searchsorted(dates - timedelta(days=lookback * 2), side="left")
+    valid = (stop - first) >= lookback
+    result.loc[~valid, "error"] = "Not enough data to make prediction"
+    if not valid.any():
+        return result
+
+    scaler = get_scaler()
+    scaled = scaler.transform(close.reshape(-1, 1)).ravel()
+    windows = sliding_window_view(scaled, lookback)[stop[valid] - lookback]
+    try:
+        scaled_pred = get_model().predict(windows.reshape(-1, lookback, 1), verbose=0)
+        result.loc[valid, "lstm_pred"] = scaler.inverse_transform(scaled_pred).ravel()
+    except Exception as e:
+        result.loc[valid, "error"] = f"Prediction failed: {e}"
+    return result
+
+def generate_lstm_predictions(start_date, end_date, lstm_model):
+    dates = pd.date_range(start_date, end_date, freq="B")  # business days
+    predictions = lstm_model.predict_prices(dates)
+    failed = predictions[predictions["error"].notna()]
+    for date, error in zip(failed["date"], failed["error"]):
+        print(f"[WARN] No LSTM prediction for {date.date()}: {error}")
+    return predictions[["date", "lstm_pred"]]
@@ -1,24 +1,40 @@
-from helpers import get_ndx_prices, generate_lstm_predictions, collect_sentiment_series, build_fusion_training_data
+from Fusion_Model.helpers import get_ndx_prices, generate_lstm_predictions, collect_sentiment_series, build_fusion_training_data
 from Fusion_Model.fuse import FusionModel
+from Pipeline.profiling import finish_run, stage, start_run
 
-start_date = "2025-03-10"
-end_date = "2025-05-31"
-api_key = "-"
+START_DATE = "2025-03-10"
+END_DATE = "2025-05-31"
+API_KEY = "-"
+FUSION_MODEL_PATH = "data/fusion_model.json"
 
-print("Fetching data...")
-prices = get_ndx_prices(start_date, end_date)
-lstm_preds = generate_lstm_predictions(start_date, end_date)
-sentiment_scores = collect_sentiment_series(start_date, end_date, api_key)
 
-print("Building training data...")
-lstm_preds_train, sentiment_scores_train, true_prices_train = build_fusion_training_data(
-    prices, lstm_preds, sentiment_scores
-)
+def main(start_date=START_DATE, end_date=END_DATE, api_key=API_KEY, profile=()):
+    start_run("fusion", profile)
+    print("Fetching data...")
+    with stage("download") as record:
+        prices = get_ndx_prices(start_date, end_date)
+        record['items'] = len(prices)
+    with stage("lstm_predictions") as record:
+        lstm_preds = generate_lstm_predictions(start_date, end_date)
+        record['items'] = len(lstm_preds)
+    sentiment_scores = collect_sentiment_series(start_date, end_date, api_key)
 
-print("Training fusion model...")
-fusion = FusionModel()
-fusion.train(lstm_preds_train, sentiment_scores_train, true_prices_train)
+    print("Building training data...")
+    lstm_preds_train, sentiment_scores_train, true_prices_train = build_fusion_training_data(
+        prices, lstm_preds, sentiment_scores
+    )
 
-print("Evaluating...")
-example_pred = fusion.predict(lstm_preds_train[-1], sentiment_scores_train[-1])
-print("Predicted final price:", example_pred)
\ No newline at end of file
+    print("Training fusion model...")
+    fusion = FusionModel()
+    with stage("fusion_fit", items=len(true_prices_train)):
+        fusion.train(lstm_preds_train, sentiment_scores_train, true_prices_train)
+
+    print("Evaluating...")
+    example_pred = fusion.predict(lstm_preds_train[-1], sentiment_scores_train[-1])
+    print("Predicted final price:", example_pred)
+    fusion.save(FUSION_MODEL_PATH)  # later days can be folded in with FusionModel.load(...).update(...)
+    finish_run()
+    return fusion
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,5 @@
 import re
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-nlp = spacy.load("en_core_web_sm")
+import numpy as np
 
 NDX_KEYWORDS = [
     "NASDAQ", "NDX", "tech sector", "big tech", "FAANG", "stock index",
@@ -13,25 +9,86 @@ NDX_KEYWORDS = [
     "stock market", "Wall Street", "Fed", "interest rate", "inflation", "SP500"
 ]
 
-def is_relevant_news(text: str, threshold: float = 0.25) -> bool:
-    if not text:
-        return False
 
-    text_lower = text.lower()
+class NewsRelevanceFilter:
+    # Keyword match first, then the mean TF-IDF cosine similarity a TfidfVectorizer
+    # fitted on [text] + keywords would give. Only whether the article contains each
+    # keyword term changes the IDF, so the keyword side is fitted once and a whole
+    # batch of articles is scored with a few matrix products.
+    def __init__(self, keywords=NDX_KEYWORDS, threshold=0.25):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.keywords = list(keywords)
+        self.threshold = threshold
+        # Substring semantics, as with `keyword.lower() in text.lower()`
+        self.pattern = re.compile("|".join(re.escape(k) for k in self.keywords), re.IGNORECASE)
+
+        self.vocab_vectorizer = CountVectorizer().fit(self.keywords)
+        self.keyword_counts = self.vocab_vectorizer.transform(self.keywords).toarray().astype(float)
+        self.keyword_df = (self.keyword_counts > 0).sum(axis=0)
+        self.n_docs = len(self.keywords) + 1
+
+    def keyword_mask(self, texts):
+        search = self.pattern.search
+        return np.fromiter((bool(t) and search(t) is not None for t in texts), dtype=bool, count=len(texts))
+
+    def similarity(self, texts):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        if len(texts) == 0:
+            return np.zeros(0)
+        counts = self.vocab_vectorizer.transform(texts).toarray().astype(float)
+        # Squared counts of tokens outside the keyword vocabulary only enter the article's norm
+        try:
+            all_counts = CountVectorizer().fit_transform(texts)
+            total_sq = np.asarray(all_counts.multiply(all_counts).sum(axis=1), dtype=float).ravel()
+        except ValueError:  # no token in any text
+            total_sq = np.zeros(len(texts))
+        oov_sq = total_sq - (counts ** 2).sum(axis=1)
+
+        present = (counts > 0).astype(float)
+        idf = np.log((self.n_docs + 1) / (1 + self.keyword_df + present)) + 1
+        oov_idf = np.log((self.n_docs + 1) / 2) + 1
+        idf_sq = idf ** 2
 
-    # Fast keyword match (early exit if obvious match)
-    for keyword in NDX_KEYWORDS:
-        if keyword.lower() in text_lower:
-            return True
+        text_norm = np.sqrt(((counts * idf) ** 2).sum(axis=1) + oov_idf ** 2 * oov_sq)
+        keyword_norm = np.sqrt(idf_sq @ (self.keyword_counts ** 2).T)
+        dots = (counts * idf_sq) @ self.keyword_counts.T
 
-    # Semantic similarity for subtle relevance
-    vectorizer = TfidfVectorizer().fit([text] + NDX_KEYWORDS)
-    vectors = vectorizer.transform([text] + NDX_KEYWORDS)
-    similarity = cosine_similarity(vectors[0:1], vectors[1:]).mean()
+        denom = text_norm[:, None] * keyword_norm
+        sims = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+        return sims.mean(axis=1)
 
-    return similarity > threshold
+    def relevance_mask(self, texts):
+        texts = list(texts)
+        mask = self.keyword_mask(texts)
+        non_empty = np.fromiter((bool(t) for t in texts), dtype=bool, count=len(texts))
+        pending = np.flatnonzero(~mask & non_empty)
+        if len(pending):
+            mask[pending] = self.similarity([texts[i] for i in pending]) > self.threshold
+        return mask
+
+
+_default_filter = None
+
+
+def get_default_filter():
+    global _default_filter
+    if _default_filter is None:
+        _default_filter = NewsRelevanceFilter()
+    return _default_filter
+
+
+def is_relevant_news(text: str, threshold: float = 0.25) -> bool:
+    if not text:
+        return False
+    relevance = get_default_filter()
+    if relevance.pattern.search(text):
+        return True
+    return bool(relevance.similarity([text])[0] > threshold)
 
 def filter_news(df):
     df["combined_text"] = df["title"].fillna("") + " " + df["description"].fillna("")
-    df["is_relevant"] = df["combined_text"].apply(is_relevant_news)
-    return df[df["is_relevant"]].drop(columns=["combined_text", "is_relevant"])
+    df["is_relevant"] = get_default_filter().relevance_mask(df["combined_text"].tolist())
+    # combined_text stays: apply_sentiment scores it
+    return df[df["is_relevant"]].drop(columns=["is_relevant"])
@@ -1,9 +1,48 @@
+import hashlib
+import json
+import os
+import threading
+import time
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+NEWS_CACHE_DIR = "data/news_cache"
+PAGE_SIZE = 100
+
+
+def articles_to_frame(articles, from_date=None):
+    if not articles:
+        print(f"[INFO] No articles found for {from_date}")
+        return pd.DataFrame()
+
+    records = []
+    for a in articles:
+        if not all(k in a for k in ["publishedAt", "title", "description", "content", "source"]):
+            continue
+        records.append({
+            "publishedAt": a["publishedAt"],
+            "title": a["title"],
+            "description": a["description"],
+            "content": a["content"],
+            "source": a["source"]["name"] if isinstance(a["source"], dict) else a["source"]
+        })
+
+    news_df = pd.DataFrame(records)
+    if "publishedAt" not in news_df.columns or news_df.empty:
+        print(f"[WARN] No usable articles for {from_date}")
+        return pd.DataFrame()
+
+    news_df["publishedAt"] = pd.to_datetime(news_df["publishedAt"]).dt.date
+    return news_df
+
 
 def fetch_news(query="NASDAQ", from_date=None, to_date=None, api_key="-"):
-    url = "https://newsapi.org/v2/everything"
+    url = NEWSAPI_URL
     if not from_date:
         from_date = (datetime.today() - timedelta(days=7)).strftime('%Y-%m-%d')
     if not to_date:
@@ -16,38 +55,124 @@ def fetch_news(query="NASDAQ", from_date=None, to_date=None, api_key="-"):
         "language": "en",
         "sortBy": "relevancy",
         "apiKey": api_key,
-        "pageSize": 100
+        "pageSize": PAGE_SIZE
     }
 
     try:
         response = requests.get(url, params=params)
         data = response.json()
-        articles = data.get("articles", [])
-        
-        if not articles:
-            print(f"[INFO] No articles found for {from_date}")
-            return pd.DataFrame()
-
-        records = []
-        for a in articles:
-            if not all(k in a for k in ["publishedAt", "title", "description", "content", "source"]):
-                continue
-            records.append({
-                "publishedAt": a["publishedAt"],
-                "title": a["title"],
-                "description": a["description"],
-                "content": a["content"],
-                "source": a["source"]["name"] if isinstance(a["source"], dict) else a["source"]
-            })
-
-        news_df = pd.DataFrame(records)
-        if "publishedAt" not in news_df.columns or news_df.empty:
-            print(f"[WARN] No usable articles for {from_date}")
-            return pd.DataFrame()
-
-        news_df["publishedAt"] = pd.to_datetime(news_df["publishedAt"]).dt.date
-        return news_df
+        return articles_to_frame(data.get("articles", []), from_date)
 
     except Exception as e:
         print(f"[ERROR] Failed fetching news: {e}")
         return pd.DataFrame()
+
+
+class RateLimiter:
+    # Spaces request start times at least 1/rate seconds apart across all threads
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class NewsApiClient:
+    def __init__(self, api_key="-", base_url=NEWSAPI_URL, cache_dir=NEWS_CACHE_DIR,
+                 max_workers=4, requests_per_second=2.0, retries=5, backoff_factor=1.0,
+                 max_pages=5, timeout=30):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+        retry = Retry(total=retries, backoff_factor=backoff_factor,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=["GET"], respect_retry_after_header=True)
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=max_workers)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _cache_path(self, query, date_str):
+        key = hashlib.sha1(f"{query}|{date_str}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_cache(self, query, date_str):
+        if not self.cache_dir:
+            return None
+        path = self._cache_path(query, date_str)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)["articles"]
+
+    def _write_cache(self, query, date_str, articles):
+        # Days that are not over yet can still gain articles, so only finished days are cached
+        if not self.cache_dir or date_str >= datetime.today().strftime('%Y-%m-%d'):
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(query, date_str)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"query": query, "date": date_str, "articles": articles}, f)
+        os.replace(tmp_path, path)
+
+    def _get_page(self, query, date_str, page):
+        params = {
+            "q": query,
+            "from": date_str,
+            "to": date_str,
+            "language": "en",
+            "sortBy": "relevancy",
+            "apiKey": self.api_key,
+            "pageSize": PAGE_SIZE,
+            "page": page
+        }
+        self.rate_limiter.wait()
+        response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+        return response.json()
+
+    def fetch_day_articles(self, date_str, query="NASDAQ"):
+        cached = self._read_cache(query, date_str)
+        if cached is not None:
+            return cached
+
+        articles = []
+        for page in range(1, self.max_pages + 1):
+            data = self._get_page(query, date_str, page)
+            if data.get("status") == "error":
+                # Free plans stop at 100 results; keep what was already collected
+                if page > 1 and data.get("code") == "maximumResultsReached":
+                    break
+                raise RuntimeError(f"{data.get('code')}: {data.get('message')}")
+            batch = data.get("articles", [])
+            articles.extend(batch)
+            if len(batch) < PAGE_SIZE or len(articles) >= data.get("totalResults", 0):
+                break
+
+        self._write_cache(query, date_str, articles)
+        return articles
+
+    def fetch_day(self, date_str, query="NASDAQ"):
+        try:
+            return articles_to_frame(self.fetch_day_articles(date_str, query), date_str)
+        except Exception as e:
+            print(f"[ERROR] Failed fetching news for {date_str}: {e}")
+            return pd.DataFrame()
+
+    def fetch_days(self, dates, query="NASDAQ"):
+        date_strs = [pd.to_datetime(d).strftime('%Y-%m-%d') for d in dates]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            frames = list(pool.map(lambda d: self.fetch_day(d, query), date_strs))
+        return dict(zip(date_strs, frames))
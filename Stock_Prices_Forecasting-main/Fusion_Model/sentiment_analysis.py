@@ -1,21 +1,169 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import functools
+import hashlib
+import os
+import sqlite3
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+SENTIMENT_CACHE_PATH = "data/sentiment_cache.sqlite"
+FINBERT_MODEL = "yiyanghkust/finbert-tone"
+
+
+class VaderBackend:
+    name = "vader"
+
+    def __init__(self):
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        self.analyzer = SentimentIntensityAnalyzer()
+
+    def factory(self):
+        return functools.partial(VaderBackend)
+
+    def score(self, texts):
+        polarity = self.analyzer.polarity_scores
+        return np.array([polarity(text)["compound"] if text else 0.0 for text in texts], dtype=float)
+
+
+class FinBertBackend:
+    # P(positive) - P(negative), so scores share VADER's [-1, 1] range
+    def __init__(self, model_name=FINBERT_MODEL, batch_size=32, max_length=512):
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        self.name = f"finbert:{model_name}"
+        self.config = {'model_name': model_name, 'batch_size': batch_size, 'max_length': max_length}
+        self.torch = torch
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        labels = {i: label.lower() for i, label in self.model.config.id2label.items()}
+        self.positive = next(i for i, label in labels.items() if label.startswith("pos"))
+        self.negative = next(i for i, label in labels.items() if label.startswith("neg"))
+
+    def factory(self):
+        # Picklable constructor with this backend's settings, for pool workers
+        return functools.partial(FinBertBackend, **self.config)
+
+    def score(self, texts):
+        scores = np.zeros(len(texts), dtype=float)
+        with self.torch.inference_mode():
+            for start in range(0, len(texts), self.batch_size):
+                batch = [text or "" for text in texts[start:start + self.batch_size]]
+                inputs = self.tokenizer(batch, padding=True, truncation=True,
+                                        max_length=self.max_length, return_tensors="pt")
+                probs = self.torch.softmax(self.model(**inputs).logits, dim=-1).numpy()
+                scores[start:start + len(batch)] = probs[:, self.positive] - probs[:, self.negative]
+        # Empty text scores 0, as with VADER
+        scores[[not text for text in texts]] = 0.0
+        return scores
+
+
+class SentimentCache:
+    # Scores keyed by (backend, sha1 of the text), so syndicated headlines are scored once
+    def __init__(self, path=SENTIMENT_CACHE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS scores ("
+                              "backend TEXT NOT NULL, text_hash TEXT NOT NULL, score REAL NOT NULL, "
+                              "PRIMARY KEY (backend, text_hash))")
+
+    def get_many(self, backend_name, hashes):
+        found = {}
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT text_hash, score FROM scores WHERE backend = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                [backend_name, *chunk])
+            found.update(rows)
+        return found
+
+    def put_many(self, backend_name, scores):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?)",
+                                  [(backend_name, h, float(s)) for h, s in scores.items()])
+
+
+def text_hash(text):
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+_worker_backend = None
+
+
+def _init_worker(backend_factory):
+    global _worker_backend
+    _worker_backend = backend_factory()
+
+
+def _score_in_worker(texts):
+    return _worker_backend.score(texts)
+
+
+def score_texts(texts, backend=None, cache=None, n_jobs=1, backend_factory=None, chunk_size=2000):
+    # Score each distinct uncached text once; n_jobs > 1 spreads the work over a process pool
+    # whose workers build their own backend with backend_factory (by default backend.factory(),
+    # which keeps its settings, so worker scores match the cache key backend.name)
+    backend = backend or get_default_backend()
+    if backend_factory is None:
+        backend_factory = backend.factory() if hasattr(backend, "factory") else type(backend)
+    hashes = [text_hash(t) for t in texts]
+    unique = dict(zip(hashes, texts))
+
+    scores = cache.get_many(backend.name, list(unique)) if cache is not None else {}
+    todo = [h for h in unique if h not in scores]
+    if todo:
+        todo_texts = [unique[h] for h in todo]
+        if n_jobs > 1 and len(todo_texts) > chunk_size:
+            chunks = [todo_texts[i:i + chunk_size] for i in range(0, len(todo_texts), chunk_size)]
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                     initargs=(backend_factory,)) as pool:
+                new_scores = np.concatenate(list(pool.map(_score_in_worker, chunks)))
+        else:
+            new_scores = backend.score(todo_texts)
+        new_scores = dict(zip(todo, new_scores))
+        if cache is not None:
+            cache.put_many(backend.name, new_scores)
+        scores.update(new_scores)
+
+    return np.array([scores[h] for h in hashes], dtype=float)
+
+
+_default_backend = None
+_default_cache = None
+
+
+def get_default_backend():
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = VaderBackend()
+    return _default_backend
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SentimentCache()
+    return _default_cache
 
-analyzer = SentimentIntensityAnalyzer()
 
 def get_sentiment_score(text):
     if not text:
         return 0
-    score = analyzer.polarity_scores(text)
-    return score["compound"]
+    return float(get_default_backend().score([text])[0])
 
-def apply_sentiment(df):
+def apply_sentiment(df, backend=None, cache=None, n_jobs=1):
     if df.empty or "combined_text" not in df.columns:
         print("[WARNING] No data or missing 'combined_text' column for sentiment analysis.")
         print("News DataFrame columns:", df.columns)
         return df
-    df["sentiment_score"] = df["combined_text"].apply(get_sentiment_score)
+    cache = get_default_cache() if cache is None else cache  # cache=False disables it
+    df["sentiment_score"] = score_texts(df["combined_text"].tolist(), backend=backend, cache=cache or None, n_jobs=n_jobs)
     return df
 
 
 def aggregate_sentiment_by_date(df):
-    return df.groupby("publishedAt")["sentiment_score"].mean().reset_index()
\ No newline at end of file
+    return df.groupby("publishedAt")["sentiment_score"].mean().reset_index()
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from Pipeline.evaluation import threshold_sweep
+from Pipeline.orchestrator import init_training_worker
+
+BACKTEST_CACHE_DIR = "data/backtest_cache"
+TRADING_DAYS = 252
+
+
+def forward_returns(data, horizon):
+    # The return each target class bets on: next session's open-to-close for the daily target,
+    # close-to-close over the horizon for weekly and monthly
+    close = data['Adj Close'] if 'Adj Close' in data.columns else data['Close']
+    if horizon == 1:
+        next_open = data['Open'].shift(-1)
+        return (close.shift(-1) - next_open) / next_open
+    return close.shift(-horizon) / close - 1
+
+
+def walk_forward_splits(n_samples, n_folds=5, min_train=0.5, horizon=1, window=None):
+    # Expanding (or rolling, with `window`) train blocks followed by equal test blocks.
+    # The last `horizon` train samples are purged: their labels look into the test block.
+    first_test = int(n_samples * min_train) if isinstance(min_train, float) else int(min_train)
+    fold_size = (n_samples - first_test) // n_folds
+    if fold_size <= 0:
+        raise ValueError("Not enough samples for the requested number of folds")
+    splits = []
+    for k in range(n_folds):
+        test_start = first_test + k * fold_size
+        test_end = n_samples if k == n_folds - 1 else test_start + fold_size
+        train_end = max(test_start - horizon, 0)
+        train_start = max(train_end - window, 0) if window else 0
+        splits.append((train_start, train_end, test_start, test_end))
+    return splits
+
+
+def _scale_fold(X, train_start, train_end, test_start, test_end):
+    # Scaler fitted on the fold's train block only
+    from sklearn.preprocessing import StandardScaler
+
+    n_features = X.shape[2]
+    scaler = StandardScaler().fit(X[train_start:train_end].reshape(-1, n_features))
+    X_train = scaler.transform(X[train_start:train_end].reshape(-1, n_features)).reshape(X[train_start:train_end].shape)
+    X_test = scaler.transform(X[test_start:test_end].reshape(-1, n_features)).reshape(X[test_start:test_end].shape)
+    return X_train.astype(np.float32), X_test.astype(np.float32)
+
+
+def cache_fold_matrices(X, y, splits, cache_dir=BACKTEST_CACHE_DIR):
+    # Scaled fold matrices keyed by the data and the split layout, so sweeps over model
+    # hyperparameters reuse them instead of rescaling
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(X).tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    digest.update(json.dumps(splits).encode())
+    fold_dir = os.path.join(cache_dir, digest.hexdigest()[:16])
+
+    paths = []
+    for k, (train_start, train_end, test_start, test_end) in enumerate(splits):
+        train_path = os.path.join(fold_dir, f"fold{k}_train.npy")
+        test_path = os.path.join(fold_dir, f"fold{k}_test.npy")
+        if not (os.path.exists(train_path) and os.path.exists(test_path)):
+            os.makedirs(fold_dir, exist_ok=True)
+            X_train, X_test = _scale_fold(X, train_start, train_end, test_start, test_end)
+            np.save(train_path, X_train)
+            np.save(test_path, X_test)
+        paths.append((train_path, test_path))
+    return paths
+
+
+def _run_fold(job):
+    from Pipeline.pipeline import build_lstm_model
+
+    X_train = np.load(job['train_path'], mmap_mode='r')
+    X_test = np.load(job['test_path'], mmap_mode='r')
+    y_train, y_test = job['y_train'], job['y_test']
+    model = build_lstm_model((X_train.shape[1], X_train.shape[2]))
+    model.fit(np.asarray(X_train), y_train, epochs=job['epochs'], batch_size=job['batch_size'], verbose=0, shuffle=True)
+    return model.predict(np.asarray(X_test), verbose=0).flatten()
+
+
+def fold_metrics(y_true, y_prob, returns, threshold=0.5, horizon=1, allow_short=True):
+    from sklearn.metrics import roc_auc_score
+
+    sweep = threshold_sweep(y_true, y_prob, [threshold])
+    y_pred = (y_prob >= threshold).astype(int)
+    position = np.where(y_pred == 1, 1.0, -1.0 if allow_short else 0.0)
+    # Overlapping horizons: each day commits 1/horizon of capital to its signal
+    pnl = position * returns / horizon
+    sharpe = pnl.mean() / pnl.std() * np.sqrt(TRADING_DAYS) if pnl.std() > 0 else 0.0
+    return {
+        'auc': float(roc_auc_score(y_true, y_prob)) if len(np.unique(y_true)) == 2 else None,
+        'accuracy': float((y_pred == y_true).mean()),
+        'precision': float(sweep['precision'][0]),
+        'recall': float(sweep['recall'][0]),
+        'f1': float(sweep['f1'][0]),
+        'pnl': float(pnl.sum()),
+        'buy_and_hold': float(returns.sum() / horizon),
+        'sharpe': float(sharpe),
+        'hit_rate': float((np.sign(position * returns) > 0)[position != 0].mean()) if (position != 0).any() else None,
+    }
+
+
+def walk_forward_backtest(data, target_column, horizon, backcandles=15, min_date='2024-12-31', n_folds=5,
+                          min_train=0.5, window=None, epochs=25, batch_size=32, threshold=0.5, allow_short=True,
+                          max_workers=None, tf_threads=1, cache_dir=BACKTEST_CACHE_DIR):
+    from Pipeline.pipeline import prepare_dataset
+
+    data = data.copy()
+    data['ForwardReturn'] = forward_returns(data, horizon)
+    X, y, _, rows = prepare_dataset(data, target_column, backcandles=backcandles, horizon=horizon,
+                                    materialize=True, min_date=min_date, return_rows=True)
+    returns = rows['ForwardReturn'].to_numpy(dtype=float)
+
+    splits = walk_forward_splits(len(y), n_folds, min_train, horizon, window)
+    paths = cache_fold_matrices(X, y, splits, cache_dir)
+    jobs = [{'train_path': train_path, 'test_path': test_path,
+             'y_train': y[train_start:train_end], 'y_test': y[test_start:test_end],
+             'epochs': epochs, 'batch_size': batch_size}
+            for (train_path, test_path), (train_start, train_end, test_start, test_end) in zip(paths, splits)]
+
+    max_workers = max_workers or max(1, min(len(jobs), (os.cpu_count() or 1) // tf_threads))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=init_training_worker, initargs=(tf_threads,)) as pool:
+        probs = list(pool.map(_run_fold, jobs))
+
+    fold_rows, predictions = [], []
+    for k, ((train_start, train_end, test_start, test_end), y_prob) in enumerate(zip(splits, probs)):
+        y_test, fold_returns = y[test_start:test_end], returns[test_start:test_end]
+        fold_rows.append(dict(
+            fold=k,
+            train_start=rows['Date'].iloc[train_start], train_end=rows['Date'].iloc[train_end - 1],
+            test_start=rows['Date'].iloc[test_start], test_end=rows['Date'].iloc[test_end - 1],
+            n_train=train_end - train_start, n_test=test_end - test_start,
+            **fold_metrics(y_test, y_prob, fold_returns, threshold, horizon, allow_short)))
+        predictions.append(pd.DataFrame({'Date': rows['Date'].iloc[test_start:test_end].to_numpy(), 'fold': k,
+                                         'y_true': y_test, 'y_prob': y_prob, 'forward_return': fold_returns}))
+
+    predictions = pd.concat(predictions, ignore_index=True)
+    overall = fold_metrics(predictions['y_true'].to_numpy(), predictions['y_prob'].to_numpy(),
+                           predictions['forward_return'].to_numpy(), threshold, horizon, allow_short)
+    return {'folds': pd.DataFrame(fold_rows), 'predictions': predictions, 'overall': overall}
@@ -0,0 +1,93 @@
+import io
+import json
+import os
+import tempfile
+import zipfile
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from Pipeline.numpy_inference import export_numpy_model, load_numpy_model
+from Pipeline.windowing import build_windows
+
+BUNDLE_NAME = "bundle.zip"
+
+
+class InferenceBundle:
+    # Everything needed to turn a feature frame into directions for one horizon
+    def __init__(self, model, scaler, threshold, feature_columns, backcandles, metadata=None):
+        self.model = model
+        self.scaler = scaler
+        self.threshold = threshold
+        self.feature_columns = list(feature_columns)
+        self.backcandles = backcandles
+        self.metadata = metadata or {}
+
+    def predict_proba(self, X):
+        orig_shape = X.shape
+        X_scaled = self.scaler.transform(X.reshape(-1, orig_shape[2])).reshape(orig_shape)
+        return self.model.predict(X_scaled, verbose=0).flatten()
+
+    def predict_frame(self, data):
+        # Same alignment as pipeline.predict_direction: row i is predicted from rows i-backcandles .. i-1
+        data = data.reset_index(drop=True)
+        X = build_windows(data, self.feature_columns, self.backcandles)
+        y_prob = self.predict_proba(X) if len(X) else np.empty(0)
+        threshold = 0.5 if self.threshold is None else self.threshold
+        return pd.DataFrame({
+            'Date': data['Date'].iloc[self.backcandles:].reset_index(drop=True),
+            'Probability': y_prob,
+            'Prediction': (y_prob >= threshold).astype(int),
+        })
+
+
+def save_bundle(path, model, scaler, threshold, feature_columns, backcandles, sample=None, **metadata):
+    # `sample` (scaled windows) lets the NumPy export be checked against Keras before it is written
+    metadata = dict(metadata, threshold=None if threshold is None else float(threshold),
+                    feature_columns=list(feature_columns), backcandles=int(backcandles))
+    scaler_buffer = io.BytesIO()
+    joblib.dump(scaler, scaler_buffer)
+    weights_buffer = io.BytesIO()
+    try:
+        export_numpy_model(model, weights_buffer, sample=sample)
+        metadata['numpy_runtime'] = True
+    except ValueError as e:
+        print(f"[WARN] Bundle will need TensorFlow: {e}")
+        metadata['numpy_runtime'] = False
+
+    # Keras can only write HDF5 to a real file
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, "model.h5")
+        model.save(model_path)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as bundle:
+            bundle.write(model_path, "model.h5")
+            bundle.writestr("scaler.joblib", scaler_buffer.getvalue())
+            if metadata['numpy_runtime']:
+                bundle.writestr("weights.npz", weights_buffer.getvalue())
+            bundle.writestr("metadata.json", json.dumps(metadata, indent=2))
+    return metadata
+
+
+def read_bundle_metadata(path):
+    with zipfile.ZipFile(path) as bundle:
+        return json.loads(bundle.read("metadata.json"))
+
+
+def load_bundle(path, compile=False, runtime="keras"):
+    # runtime="numpy" serves the exported weights without importing TensorFlow
+    with zipfile.ZipFile(path) as bundle, tempfile.TemporaryDirectory() as tmp_dir:
+        metadata = json.loads(bundle.read("metadata.json"))
+        scaler = joblib.load(io.BytesIO(bundle.read("scaler.joblib")))
+        if runtime == "numpy":
+            if not metadata.get('numpy_runtime'):
+                raise ValueError(f"{path} has no NumPy weights; load it with runtime='keras'")
+            model = load_numpy_model(io.BytesIO(bundle.read("weights.npz")))
+        elif runtime == "keras":
+            from tensorflow.keras.models import load_model
+            model_path = bundle.extract("model.h5", tmp_dir)
+            model = load_model(model_path, compile=compile)
+        else:
+            raise ValueError(f"Unknown runtime: {runtime}")
+    return InferenceBundle(model, scaler, metadata['threshold'], metadata['feature_columns'],
+                           metadata['backcandles'], metadata)
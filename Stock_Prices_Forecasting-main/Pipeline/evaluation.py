@@ -0,0 +1,112 @@
+import json
+import os
+import time
+
+import numpy as np
+from sklearn.metrics import (
+    classification_report, confusion_matrix, ConfusionMatrixDisplay,
+    roc_curve, auc, precision_recall_curve, average_precision_score
+)
+
+THRESHOLDS = np.linspace(0, 1, 101)
+
+
+def threshold_sweep(y_true, y_prob, thresholds=THRESHOLDS):
+    # Precision/recall/F1 of (y_prob >= t) for every t from one sort and a cumulative count:
+    # after sorting, the predicted positives at t are a suffix, so TP is a suffix sum of labels.
+    y_true = np.asarray(y_true).astype(bool)
+    y_prob = np.asarray(y_prob, dtype=np.float64).ravel()
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    order = np.argsort(y_prob, kind='stable')
+    sorted_prob = y_prob[order]
+    positives_from = np.concatenate([np.cumsum(y_true[order][::-1])[::-1], [0]])
+
+    first = np.searchsorted(sorted_prob, thresholds, side='left')
+    tp = positives_from[first].astype(np.float64)
+    predicted = len(y_prob) - first
+    actual = y_true.sum()
+
+    # zero_division=0, as sklearn's f1/precision/recall report it
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = tp / actual if actual else np.zeros_like(tp)
+    denom = predicted + actual
+    f1 = np.divide(2 * tp, denom, out=np.zeros_like(tp), where=denom > 0)
+    return {'thresholds': thresholds, 'precision': precision, 'recall': recall, 'f1': f1}
+
+
+def _save_plots(output_dir, y_true, y_prob, y_pred):
+    # Figure objects render straight to PNG, with no display and no pyplot state
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ConfusionMatrixDisplay(confusion_matrix(y_true, y_pred)).plot(ax=fig.subplots(), cmap='Blues')
+    fig.axes[0].set_title("Confusion Matrix")
+    fig.savefig(os.path.join(output_dir, "confusion_matrix.png"))
+
+    fpr, tpr, _ = roc_curve(y_true, y_prob)
+    fig = Figure()
+    ax = fig.subplots()
+    ax.plot(fpr, tpr, label=f'AUC = {auc(fpr, tpr):.2f}')
+    ax.plot([0, 1], [0, 1], 'k--')
+    ax.set_xlabel('False Positive Rate')
+    ax.set_ylabel('True Positive Rate')
+    ax.set_title('ROC Curve')
+    ax.legend()
+    ax.grid(True)
+    fig.savefig(os.path.join(output_dir, "roc_curve.png"))
+
+    precision, recall, _ = precision_recall_curve(y_true, y_prob)
+    fig = Figure()
+    ax = fig.subplots()
+    ax.plot(recall, precision, label=f'AP = {average_precision_score(y_true, y_prob):.2f}')
+    ax.set_xlabel('Recall')
+    ax.set_ylabel('Precision')
+    ax.set_title('Precision-Recall Curve')
+    ax.legend()
+    ax.grid(True)
+    fig.savefig(os.path.join(output_dir, "precision_recall_curve.png"))
+
+
+def evaluate_predictions(y_true, y_prob, output_dir=None, plots=False, thresholds=THRESHOLDS, started_at=None):
+    started_at = time.perf_counter() if started_at is None else started_at
+    y_true = np.asarray(y_true).astype(int)
+    y_prob = np.asarray(y_prob).ravel()
+
+    sweep = threshold_sweep(y_true, y_prob, thresholds)
+    best = int(np.argmax(sweep['f1']))
+    best_t = float(sweep['thresholds'][best])
+    y_pred = (y_prob >= best_t).astype(int)
+
+    two_classes = len(np.unique(y_true)) == 2
+    if two_classes:
+        fpr, tpr, _ = roc_curve(y_true, y_prob)
+        roc_auc = float(auc(fpr, tpr))
+        pr_auc = float(average_precision_score(y_true, y_prob))
+    else:
+        roc_auc = pr_auc = None
+
+    unique, counts = np.unique(y_true, return_counts=True)
+    metrics = {
+        'best_threshold': best_t,
+        'f1': float(sweep['f1'][best]),
+        'precision': float(sweep['precision'][best]),
+        'recall': float(sweep['recall'][best]),
+        'roc_auc': roc_auc,
+        'average_precision': pr_auc,
+        'confusion_matrix': confusion_matrix(y_true, y_pred, labels=[0, 1]).tolist(),
+        'classification_report': classification_report(y_true, y_pred, labels=[0, 1], output_dict=True, zero_division=0),
+        'label_distribution': {str(k): int(v) for k, v in zip(unique, counts)},
+        'n_samples': int(len(y_true)),
+        'sweep': {k: v.tolist() for k, v in sweep.items()},
+    }
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        if plots and two_classes:
+            _save_plots(output_dir, y_true, y_prob, y_pred)
+    metrics['eval_seconds'] = time.perf_counter() - started_at
+    if output_dir:
+        with open(os.path.join(output_dir, "metrics.json"), "w") as f:
+            json.dump(metrics, f, indent=2)
+    return metrics
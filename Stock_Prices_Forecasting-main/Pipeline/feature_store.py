@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from Pipeline.indicators import INDICATOR_COLUMNS, add_indicators
+from Pipeline.market_data import get_prices
+from Pipeline.orchestrator import ticker_dirname
+from Pipeline.sentiment_store import SENTIMENT_COLUMNS
+
+# One float32 .npy file per column per (ticker, version), plus the dates, read back memory-mapped:
+# a slice of a few columns touches only those pages, with no CSV/Parquet decode and no pandas
+# object index. Layout: <root>/<ticker>/<version>/{dates.npy, <column>.npy, meta.json}, and
+# <root>/<ticker>/LATEST naming the version get_features reads by default.
+
+FEATURE_STORE_DIR = "data/features"
+TARGET_HORIZONS = {'daily': 1, 'weekly': 5, 'monthly': 20}
+TARGET_COLUMNS = {'daily': 'TargetClass', 'weekly': 'TargetWeekClass', 'monthly': 'TargetMonthClass'}
+
+
+def _target_class(delta):
+    # 1/0 like engineer_features, NaN where the future is not known yet
+    return np.where(delta.isna(), np.nan, (delta > 0).astype(float))
+
+
+def compute_features(raw_data, sentiment_df):
+    # Every column engineer_features produces for any target type, plus the merged sentiment,
+    # on the full date range (rows with unknown targets are kept, with NaN targets)
+    from Pipeline.pipeline import merge_sentiment_frame
+
+    data = raw_data if set(INDICATOR_COLUMNS).issubset(raw_data.columns) else add_indicators(raw_data)
+    data = data.copy()
+    data[INDICATOR_COLUMNS] = data[INDICATOR_COLUMNS].fillna(method='bfill')
+    data['Adj Close'] = data['Close']
+    data['Target'] = (data['Adj Close'] - data['Open']).shift(-1)
+    data['TargetClass'] = _target_class(data['Target'])
+    data['TargetNextClose'] = data['Adj Close'].shift(-1)
+    data['TargetWeek'] = data['Adj Close'].shift(-5) - data['Adj Close']
+    data['TargetWeekClass'] = _target_class(data['TargetWeek'])
+    data['TargetMonth'] = data['Adj Close'].shift(-20) - data['Adj Close']
+    data['TargetMonthClass'] = _target_class(data['TargetMonth'])
+    data = data.reset_index()
+    return merge_sentiment_frame(data, sentiment_df)
+
+
+def target_frame(features, target_type):
+    # The frame engineer_features + merge_sentiment_frame give for one target type: rows where
+    # that target is known, with only its class column kept
+    if target_type not in TARGET_COLUMNS:
+        raise ValueError("Invalid target_type. Use 'daily', 'weekly', or 'monthly'.")
+    target_column = TARGET_COLUMNS[target_type]
+    data = features.drop(columns=[c for c in features.columns if 'Target' in c and c != target_column])
+    data = data.dropna(subset=[c for c in data.columns if c not in SENTIMENT_COLUMNS]).reset_index(drop=True)
+    data[target_column] = data[target_column].astype(int)
+    return data, target_column, TARGET_HORIZONS[target_type]
+
+
+class FeatureStore:
+    def __init__(self, root=FEATURE_STORE_DIR):
+        self.root = root
+        self._open = {}
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.root, ticker_dirname(ticker))
+
+    def latest_version(self, ticker):
+        with open(os.path.join(self._ticker_dir(ticker), "LATEST")) as f:
+            return f.read().strip()
+
+    def write(self, ticker, features, version=None):
+        version = version or datetime.now().strftime("%Y%m%d-%H%M%S")
+        final_dir = os.path.join(self._ticker_dir(ticker), version)
+        tmp_dir = final_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        features = features.sort_values('Date')
+        np.save(os.path.join(tmp_dir, "dates.npy"), features['Date'].to_numpy(dtype='datetime64[D]'))
+        columns = [c for c in features.columns if c != 'Date' and pd.api.types.is_numeric_dtype(features[c])]
+        for column in columns:
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), features[column].to_numpy(dtype=np.float32))
+        meta = {'ticker': ticker, 'version': version, 'columns': columns, 'n_rows': len(features),
+                'start': str(features['Date'].iloc[0].date()) if len(features) else None,
+                'end': str(features['Date'].iloc[-1].date()) if len(features) else None,
+                'created_at': datetime.now().isoformat(timespec="seconds")}
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.replace(tmp_dir, final_dir)
+        with open(os.path.join(self._ticker_dir(ticker), "LATEST"), "w") as f:
+            f.write(version)
+        self._open.pop((ticker, version), None)
+        return meta
+
+    def build(self, ticker, start, end, version=None, sentiment_path=None, store=None):
+        from Pipeline.pipeline import SENTIMENT_PATH, load_sentiment
+
+        raw_data = get_prices(ticker, start, end, store=store)
+        if raw_data.empty:
+            raise ValueError(f"No price data for {ticker}")
+        sentiment_df = load_sentiment(sentiment_path or SENTIMENT_PATH, raw_data.index.min(), raw_data.index.max())
+        return self.write(ticker, compute_features(raw_data, sentiment_df), version)
+
+    def open(self, ticker, version=None):
+        # Memory-mapped columns of one version ("latest" or None: the LATEST one), kept open
+        version = self.latest_version(ticker) if version in (None, "latest") else version
+        key = (ticker, version)
+        if key not in self._open:
+            version_dir = os.path.join(self._ticker_dir(ticker), version)
+            with open(os.path.join(version_dir, "meta.json")) as f:
+                meta = json.load(f)
+            arrays = {c: np.load(os.path.join(version_dir, f"{c}.npy"), mmap_mode='r') for c in meta['columns']}
+            self._open[key] = (meta, np.load(os.path.join(version_dir, "dates.npy")), arrays)
+        return self._open[key]
+
+    def get_arrays(self, ticker, start=None, end=None, columns=None, version=None):
+        # Zero-copy float32 views for [start, end] (inclusive), plus their dates
+        meta, dates, arrays = self.open(ticker, version)
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start).date(), 'D'), 'left')
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end).date(), 'D'), 'right')
+        columns = meta['columns'] if columns is None else list(columns)
+        missing = [c for c in columns if c not in arrays]
+        if missing:
+            raise KeyError(f"Columns not in the feature store for {ticker}: {missing}")
+        return dates[lo:hi], {c: arrays[c][lo:hi] for c in columns}
+
+    def get_features(self, ticker, start=None, end=None, columns=None, version=None):
+        dates, arrays = self.get_arrays(ticker, start, end, columns, version)
+        data = pd.DataFrame({c: np.asarray(a) for c, a in arrays.items()})
+        data.insert(0, 'Date', dates.astype('datetime64[ns]'))
+        return data
+
+
+_default_store = None
+
+
+def get_default_feature_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = FeatureStore()
+    return _default_store
+
+
+def get_features(ticker, start=None, end=None, columns=None, version=None, store=None):
+    return (store or get_default_feature_store()).get_features(ticker, start, end, columns, version)
+
+
+def load_target_frames(ticker, target_types, start=None, end=None, version=None, store=None):
+    # What orchestrator.build_target_frames returns, read from a stored version instead
+    features = (store or get_default_feature_store()).get_features(ticker, start, end, version=version)
+    return {target_type: target_frame(features, target_type) for target_type in target_types}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build float32 feature columns for tickers")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--start", default='2024-09-30')
+    parser.add_argument("--end", default='2025-06-02')
+    parser.add_argument("--version")
+    parser.add_argument("--sentiment-path")
+    parser.add_argument("--root", default=FEATURE_STORE_DIR)
+    args = parser.parse_args(argv)
+
+    feature_store = FeatureStore(args.root)
+    for ticker in args.tickers:
+        meta = feature_store.build(ticker, args.start, args.end, args.version, args.sentiment_path)
+        print(f"[INFO] {ticker}: {meta['n_rows']} rows x {len(meta['columns'])} columns, version {meta['version']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+RSI_LENGTH = 15
+EMA_LENGTHS = {'EMAF': 20, 'EMAM': 100, 'EMAS': 150}
+INDICATOR_COLUMNS = ['RSI'] + list(EMA_LENGTHS)
+
+
+class EmaState:
+    # pandas_ta.ema: seeded with the SMA of the first `length` closes, then ewm(adjust=False)
+    def __init__(self, length, count=0, seed_sum=0.0, value=math.nan):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = count
+        self.seed_sum = seed_sum
+        self.value = value
+
+    def update(self, close):
+        self.count += 1
+        if self.count < self.length:
+            self.seed_sum += close
+            return math.nan
+        if self.count == self.length:
+            self.value = (self.seed_sum + close) / self.length
+        else:
+            self.value += self.alpha * (close - self.value)
+        return self.value
+
+    @classmethod
+    def from_series(cls, close, length):
+        ema = close.to_numpy(dtype=float).copy()
+        if len(ema) >= length:
+            ema[length - 1] = ema[:length].mean()
+        ema[:length - 1] = np.nan
+        ema = pd.Series(ema, index=close.index).ewm(span=length, adjust=False).mean()
+        state = cls(length, count=len(close), seed_sum=float(close.iloc[:length - 1].sum()))
+        if len(close) >= length:
+            state.value = float(ema.iloc[-1])
+        return state, ema
+
+    def to_dict(self):
+        return {'length': self.length, 'count': self.count, 'seed_sum': self.seed_sum, 'value': self.value}
+
+
+class RsiState:
+    # pandas_ta.rsi with mamode='rma': ewm(alpha=1/length, adjust=True, min_periods=length)
+    # of gains and losses, kept as running weighted sums so one bar is O(1).
+    def __init__(self, length, prev_close=math.nan, count=0, gain_sum=0.0, loss_sum=0.0, weight=0.0):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.prev_close = prev_close
+        self.count = count
+        self.gain_sum = gain_sum
+        self.loss_sum = loss_sum
+        self.weight = weight
+
+    def update(self, close):
+        prev, self.prev_close = self.prev_close, close
+        if math.isnan(prev):
+            return math.nan
+        change = close - prev
+        self.gain_sum = max(change, 0.0) + self.decay * self.gain_sum
+        self.loss_sum = max(-change, 0.0) + self.decay * self.loss_sum
+        self.weight = 1.0 + self.decay * self.weight
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.length or self.gain_sum + self.loss_sum == 0:
+            return math.nan
+        return 100.0 * self.gain_sum / (self.gain_sum + self.loss_sum)
+
+    @classmethod
+    def from_series(cls, close, length):
+        change = close.diff()
+        alpha = 1.0 / length
+        gain = change.clip(lower=0).ewm(alpha=alpha, min_periods=length).mean()
+        loss = (-change.clip(upper=0)).ewm(alpha=alpha, min_periods=length).mean()
+        rsi = 100.0 * gain / (gain + loss)
+
+        state = cls(length)
+        if len(close):
+            state.prev_close = float(close.iloc[-1])
+        state.count = max(len(close) - 1, 0)
+        # ewm(adjust=True) is a ratio of weighted sums; the denominator has a closed form
+        state.weight = (1.0 - state.decay ** state.count) / (1.0 - state.decay)
+        if state.count:
+            raw_gain = change.clip(lower=0).ewm(alpha=alpha).mean().iloc[-1]
+            raw_loss = (-change.clip(upper=0)).ewm(alpha=alpha).mean().iloc[-1]
+            state.gain_sum = float(raw_gain) * state.weight
+            state.loss_sum = float(raw_loss) * state.weight
+        return state, rsi
+
+    def to_dict(self):
+        return {'length': self.length, 'prev_close': self.prev_close, 'count': self.count,
+                'gain_sum': self.gain_sum, 'loss_sum': self.loss_sum, 'weight': self.weight}
+
+
+class IndicatorEngine:
+    def __init__(self, rsi_length=RSI_LENGTH, ema_lengths=None):
+        ema_lengths = ema_lengths or EMA_LENGTHS
+        self.rsi = RsiState(rsi_length)
+        self.emas = {name: EmaState(length) for name, length in ema_lengths.items()}
+        self.last_date = None
+
+    @property
+    def columns(self):
+        return ['RSI'] + list(self.emas)
+
+    def fit(self, data):
+        # Full vectorized pass over the history; leaves the engine ready for update/append
+        close = data['Close'].astype(float)
+        features = pd.DataFrame(index=data.index)
+        self.rsi, features['RSI'] = RsiState.from_series(close, self.rsi.length)
+        for name, ema in self.emas.items():
+            self.emas[name], features[name] = EmaState.from_series(close, ema.length)
+        self.last_date = data.index[-1] if len(data) else None
+        return features
+
+    def update(self, close):
+        row = {'RSI': self.rsi.update(close)}
+        for name, ema in self.emas.items():
+            row[name] = ema.update(close)
+        return row
+
+    def append(self, data):
+        # Only bars after the last one seen are processed, so re-sending an overlapping window is safe
+        if self.last_date is not None:
+            data = data[data.index > self.last_date]
+        rows = [self.update(float(close)) for close in data['Close']]
+        if len(data):
+            self.last_date = data.index[-1]
+        return pd.DataFrame(rows, index=data.index, columns=self.columns)
+
+    def state_dict(self):
+        return {
+            'rsi': self.rsi.to_dict(),
+            'emas': {name: ema.to_dict() for name, ema in self.emas.items()},
+            'last_date': None if self.last_date is None else pd.Timestamp(self.last_date).isoformat(),
+        }
+
+    @classmethod
+    def from_state_dict(cls, state):
+        engine = cls.__new__(cls)
+        rsi = dict(state['rsi'])
+        engine.rsi = RsiState(rsi.pop('length'), **rsi)
+        engine.emas = {}
+        for name, ema in state['emas'].items():
+            ema = dict(ema)
+            engine.emas[name] = EmaState(ema.pop('length'), **ema)
+        engine.last_date = None if state['last_date'] is None else pd.Timestamp(state['last_date'])
+        return engine
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.state_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_state_dict(json.load(f))
+
+
+def add_indicators(data, engine=None):
+    engine = engine or IndicatorEngine()
+    data = data.copy()
+    features = engine.fit(data)
+    data[features.columns] = features
+    return data
@@ -0,0 +1,134 @@
+import json
+import os
+import re
+
+import pandas as pd
+
+DEFAULT_STORE_DIR = "data/market"
+OHLCV_COLUMNS = ['Close', 'High', 'Low', 'Open', 'Volume']
+
+
+def _empty_frame():
+    return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name='Date'), dtype=float)
+
+
+class YFinanceProvider:
+    def fetch(self, ticker, start, end):
+        import yfinance as yf
+
+        data = yf.download(tickers=ticker, start=start.strftime('%Y-%m-%d'), end=end.strftime('%Y-%m-%d'), progress=False)
+        # yf.download reports network/ticker errors in yf.shared._ERRORS and returns an empty frame
+        errors = getattr(getattr(yf, "shared", None), "_ERRORS", None) or {}
+        if data.empty and ticker.upper() in {str(k).upper() for k in errors}:
+            raise RuntimeError(f"Price download failed for {ticker}: {errors.get(ticker, errors.get(ticker.upper()))}")
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = [f"{col[0]}" for col in data.columns]
+        return data
+
+
+class FrameProvider:
+    # Serves fixed frames (e.g. a CSV fixture) instead of the network; records every fetch
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    @classmethod
+    def from_csv_dir(cls, directory):
+        frames = {}
+        for name in os.listdir(directory):
+            if name.endswith('.csv'):
+                frames[name[:-4]] = pd.read_csv(os.path.join(directory, name), index_col='Date', parse_dates=['Date'])
+        return cls(frames)
+
+    def fetch(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        data = self.frames.get(ticker, _empty_frame())
+        return data[(data.index >= start) & (data.index < end)]
+
+
+class MarketDataStore:
+    # Per-ticker Parquet cache. `end` is exclusive, as with yf.download.
+    def __init__(self, root=DEFAULT_STORE_DIR, provider=None):
+        self.root = root
+        self.provider = provider or YFinanceProvider()
+
+    def _paths(self, ticker):
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', ticker)
+        return os.path.join(self.root, f"{name}.parquet"), os.path.join(self.root, f"{name}.json")
+
+    def _read(self, ticker):
+        data_path, meta_path = self._paths(ticker)
+        if not os.path.exists(meta_path):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        data = pd.read_parquet(data_path) if os.path.exists(data_path) else _empty_frame()
+        return data, (pd.Timestamp(meta['start']), pd.Timestamp(meta['end']))
+
+    def _write(self, ticker, data, coverage):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+        data.to_parquet(data_path)
+        # Metadata last, so a crash mid-write never claims coverage the Parquet file lacks
+        with open(meta_path, 'w') as f:
+            json.dump({'start': coverage[0].isoformat(), 'end': coverage[1].isoformat()}, f)
+
+    @staticmethod
+    def _missing_ranges(coverage, start, end):
+        if coverage is None:
+            return [(start, end)]
+        covered_start, covered_end = coverage
+        ranges = []
+        # Always extend from the covered edge so the covered interval stays contiguous
+        if start < covered_start:
+            ranges.append((start, covered_start))
+        if end > covered_end:
+            ranges.append((covered_end, end))
+        return ranges
+
+    def get(self, ticker, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        cached, coverage = self._read(ticker)
+        missing = self._missing_ranges(coverage, start, end)
+
+        if missing:
+            frames = [] if cached is None else [cached]
+            new_start, new_end = coverage if coverage is not None else (None, None)
+            today = pd.Timestamp.today().normalize()
+            for range_start, range_end in missing:
+                # A provider error (e.g. a failed download) raises here, before anything is written
+                fetched = self.provider.fetch(ticker, range_start, range_end)
+                if len(fetched):
+                    frames.append(fetched)
+                elif range_end > today:
+                    # Bars up to today may not be published yet: ask again next time
+                    continue
+                # Otherwise an empty range (weekend, holiday) is covered like any other
+                new_start = range_start if new_start is None else min(new_start, range_start)
+                new_end = range_end if new_end is None else max(new_end, range_end)
+            data = pd.concat(frames) if frames else _empty_frame()
+            data = data[~data.index.duplicated(keep='last')].sort_index()
+            data.index.name = 'Date'
+
+            if new_start is not None and (new_start, new_end) != coverage:
+                # Today's bar may still be forming, so it is never marked as covered
+                new_end = max(new_start, min(new_end, today))
+                self._write(ticker, data, (new_start, new_end))
+        else:
+            data = cached
+
+        return data[(data.index >= start) & (data.index < end)].copy()
+
+
+_default_store = None
+
+
+def get_default_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = MarketDataStore()
+    return _default_store
+
+
+def get_prices(ticker, start, end, store=None):
+    return (store or get_default_store()).get(ticker, start, end)
@@ -0,0 +1,123 @@
+import json
+
+import numpy as np
+
+# TensorFlow-free forward pass for the networks build_lstm_model produces
+# (Bidirectional/plain LSTM, Dropout and Dense layers). Only export_layers needs Keras.
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 0.5 * (np.tanh(0.5 * x) + 1),  # no overflow for large |x|
+}
+
+
+def _lstm(x, kernel, recurrent_kernel, bias, activation, recurrent_activation, return_sequences, go_backwards=False):
+    act, rec_act = ACTIVATIONS[activation], ACTIVATIONS[recurrent_activation]
+    n, steps, _ = x.shape
+    units = recurrent_kernel.shape[0]
+    # Input projections for every step in one matmul; only the recurrent part stays in the loop
+    projected = x @ kernel + bias
+    h = np.zeros((n, units), dtype=x.dtype)
+    c = np.zeros((n, units), dtype=x.dtype)
+    outputs = np.empty((n, steps, units), dtype=x.dtype) if return_sequences else None
+    for t in (range(steps - 1, -1, -1) if go_backwards else range(steps)):
+        z = projected[:, t] + h @ recurrent_kernel
+        i = rec_act(z[:, :units])
+        f = rec_act(z[:, units:2 * units])
+        g = act(z[:, 2 * units:3 * units])
+        o = rec_act(z[:, 3 * units:])
+        c = f * c + i * g
+        h = o * act(c)
+        if return_sequences:
+            outputs[:, t] = h  # backward outputs land on their own time step, as Bidirectional aligns them
+    return outputs if return_sequences else h
+
+
+def _lstm_spec(layer, prefix, arrays):
+    config = layer.get_config()
+    kernel, recurrent_kernel, bias = layer.get_weights()
+    arrays[f"{prefix}_kernel"] = kernel
+    arrays[f"{prefix}_recurrent_kernel"] = recurrent_kernel
+    arrays[f"{prefix}_bias"] = bias
+    return {'prefix': prefix, 'activation': config['activation'],
+            'recurrent_activation': config['recurrent_activation'],
+            'return_sequences': config['return_sequences'], 'go_backwards': config.get('go_backwards', False)}
+
+
+def export_layers(model):
+    specs, arrays = [], {}
+    for i, layer in enumerate(model.layers):
+        kind = type(layer).__name__
+        if kind in ('InputLayer', 'Dropout'):
+            continue
+        if kind == 'LSTM':
+            specs.append(dict(_lstm_spec(layer, f"l{i}", arrays), type='lstm'))
+        elif kind == 'Bidirectional':
+            if layer.merge_mode != 'concat':
+                raise ValueError(f"Unsupported Bidirectional merge_mode: {layer.merge_mode}")
+            specs.append({'type': 'bidirectional',
+                          'forward': _lstm_spec(layer.forward_layer, f"l{i}f", arrays),
+                          'backward': _lstm_spec(layer.backward_layer, f"l{i}b", arrays)})
+        elif kind == 'Dense':
+            kernel, bias = layer.get_weights()
+            arrays[f"l{i}_kernel"], arrays[f"l{i}_bias"] = kernel, bias
+            specs.append({'type': 'dense', 'prefix': f"l{i}", 'activation': layer.get_config()['activation']})
+        else:
+            raise ValueError(f"Unsupported layer for NumPy export: {kind}")
+    for spec in specs:
+        for part in (spec, spec.get('forward', {}), spec.get('backward', {})):
+            if part.get('activation', 'linear') not in ACTIVATIONS or part.get('recurrent_activation', 'sigmoid') not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation in {spec}")
+    return specs, arrays
+
+
+class NumpyModel:
+    def __init__(self, specs, arrays, dtype=np.float32):
+        self.specs = specs
+        self.arrays = {k: np.asarray(v, dtype=dtype) for k, v in arrays.items()}
+        self.dtype = dtype
+
+    def _run_lstm(self, x, spec):
+        p = spec['prefix']
+        return _lstm(x, self.arrays[f"{p}_kernel"], self.arrays[f"{p}_recurrent_kernel"], self.arrays[f"{p}_bias"],
+                     spec['activation'], spec['recurrent_activation'], spec['return_sequences'], spec['go_backwards'])
+
+    def predict(self, X, batch_size=4096, verbose=0):
+        # Same call shape as keras Model.predict, so bundles can swap runtimes
+        X = np.asarray(X, dtype=self.dtype)
+        return np.concatenate([self._forward(X[i:i + batch_size]) for i in range(0, max(len(X), 1), batch_size)])
+
+    def _forward(self, x):
+        for spec in self.specs:
+            if spec['type'] == 'lstm':
+                x = self._run_lstm(x, spec)
+            elif spec['type'] == 'bidirectional':
+                x = np.concatenate([self._run_lstm(x, spec['forward']), self._run_lstm(x, spec['backward'])], axis=-1)
+            else:
+                x = ACTIVATIONS[spec['activation']](x @ self.arrays[f"{spec['prefix']}_kernel"] + self.arrays[f"{spec['prefix']}_bias"])
+        return x
+
+
+def save_numpy_model(path_or_file, specs, arrays):
+    np.savez(path_or_file, __spec__=np.array(json.dumps(specs)), **arrays)
+
+
+def load_numpy_model(path_or_file, dtype=np.float32):
+    with np.load(path_or_file) as data:
+        specs = json.loads(str(data['__spec__']))
+        arrays = {k: data[k] for k in data.files if k != '__spec__'}
+    return NumpyModel(specs, arrays, dtype)
+
+
+def export_numpy_model(model, path_or_file, sample=None, atol=1e-4):
+    # Refuses to export if the NumPy pass disagrees with Keras on `sample`
+    specs, arrays = export_layers(model)
+    if sample is not None and len(sample):
+        expected = model.predict(sample, verbose=0)
+        got = NumpyModel(specs, arrays).predict(sample)
+        if not np.allclose(got, expected, atol=atol):
+            raise ValueError(f"NumPy export diverges from Keras: max abs diff {np.abs(got - expected).max():.2e}")
+    save_numpy_model(path_or_file, specs, arrays)
+    return specs
@@ -0,0 +1,218 @@
+import argparse
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+from Pipeline.profiling import RunReport, current_run, finish_run, stage, start_run
+
+ARTIFACTS_DIR = "artifacts"
+TARGET_TYPES = ['daily', 'weekly', 'monthly']
+
+
+def ticker_dirname(ticker):
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', ticker)
+
+
+def build_target_frames(raw_data, sentiment_df, target_types=TARGET_TYPES):
+    # Indicators once per ticker, then one engineered frame per target type
+    from Pipeline.indicators import INDICATOR_COLUMNS, add_indicators
+    from Pipeline.pipeline import engineer_features, merge_sentiment_frame
+
+    if not set(INDICATOR_COLUMNS).issubset(raw_data.columns):
+        raw_data = add_indicators(raw_data)
+    frames = {}
+    for target_type in target_types:
+        data, target_column, horizon = engineer_features(raw_data, target_type)
+        frames[target_type] = (merge_sentiment_frame(data, sentiment_df), target_column, horizon)
+    return frames
+
+
+def init_training_worker(tf_threads):
+    # Must run before TensorFlow is imported in the worker
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(tf_threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ["OMP_NUM_THREADS"] = str(tf_threads)
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(tf_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _train_job(job):
+    from Pipeline.bundle import BUNDLE_NAME, save_bundle
+    from Pipeline.pipeline import build_lstm_model, evaluate_model, scale_and_split
+
+    # Timed here, in the worker; train_frames folds the stages into the parent's run report
+    report = RunReport(f"train-{ticker_dirname(job['ticker'])}-{job['target_type']}",
+                       job.get('profile'), job.get('profile_dir'), job.get('profiler', "cprofile"))
+    with report.stage("load_features") as record:
+        arrays = np.load(job['features_path'])
+        X, y = arrays['X'], arrays['y']
+        record['items'] = len(y)
+    with report.stage("scale_and_split", items=len(y)):
+        X_train, X_test, y_train, y_test, scaler = scale_and_split(X, y)
+    with report.stage("fit", items=len(y_train) * job['epochs'], unit="samples"):
+        model = build_lstm_model((X.shape[1], X.shape[2]))
+        model.fit(X_train, y_train, epochs=job['epochs'], batch_size=job['batch_size'],
+                  validation_split=0.1, verbose=0, shuffle=True)
+    out_dir = job['output_dir']
+    with report.stage("evaluate", items=len(y_test)):
+        best_t = evaluate_model(model, X_test, y_test, output_dir=out_dir, plots=True)
+
+    with report.stage("save_bundle"):
+        metadata = save_bundle(os.path.join(out_dir, BUNDLE_NAME), model, scaler, best_t,
+                               job['feature_columns'], job['backcandles'], sample=X_test[:64],
+                               ticker=job['ticker'], target_type=job['target_type'],
+                               n_samples=int(len(y)), epochs=job['epochs'])
+    return metadata, report.stages
+
+
+def train_frames(frames_by_ticker, version=None, artifacts_dir=ARTIFACTS_DIR, max_workers=None,
+                 tf_threads=1, epochs=25, batch_size=32, backcandles=15, min_date='2024-12-31'):
+    from Pipeline.pipeline import prepare_dataset
+
+    version = version or datetime.now().strftime("%Y%m%d-%H%M%S")
+    run_dir = os.path.join(artifacts_dir, version)
+    features_dir = os.path.join(run_dir, "features")
+    os.makedirs(features_dir, exist_ok=True)
+
+    # Feature matrices are built once in the parent and handed to workers as files
+    run = current_run()
+    jobs = []
+    for ticker, frames in frames_by_ticker.items():
+        for target_type, (data, target_column, horizon) in frames.items():
+            with stage(f"{ticker}/{target_type}/prepare_dataset") as record:
+                X, y, feature_columns = prepare_dataset(data, target_column=target_column, backcandles=backcandles,
+                                                        horizon=horizon, materialize=True, min_date=min_date)
+                record['items'] = len(y)
+            if len(y) == 0:
+                print(f"[WARN] No samples for {ticker} {target_type}, skipping")
+                continue
+            name = f"{ticker_dirname(ticker)}_{target_type}"
+            features_path = os.path.join(features_dir, f"{name}.npz")
+            np.savez(features_path, X=X, y=y)
+            jobs.append({
+                'ticker': ticker,
+                'target_type': target_type,
+                'features_path': features_path,
+                'output_dir': os.path.join(run_dir, ticker_dirname(ticker), target_type),
+                'feature_columns': feature_columns,
+                'backcandles': backcandles,
+                'epochs': epochs,
+                'batch_size': batch_size,
+                'profile': sorted(run.profile) if run else (),
+                'profile_dir': run.profile_dir if run else None,
+                'profiler': run.profiler if run else "cprofile",
+            })
+
+    max_workers = max_workers or max(1, (os.cpu_count() or 1) // tf_threads)
+    results, failed = {}, []
+    # spawn, not fork: TensorFlow state does not survive a fork
+    with stage("train_pool", items=len(jobs), unit="models"), \
+            ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                initializer=init_training_worker, initargs=(tf_threads,)) as pool:
+        futures = {pool.submit(_train_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                metadata, stages = future.result()
+                results[(job['ticker'], job['target_type'])] = metadata
+                if run:
+                    run.add_stages(stages, f"{job['ticker']}/{job['target_type']}")
+                print(f"[INFO] Trained {job['ticker']} {job['target_type']}")
+            except Exception as e:
+                failed.append({'ticker': job['ticker'], 'target_type': job['target_type'], 'error': str(e)})
+                print(f"[ERROR] Training failed for {job['ticker']} {job['target_type']}: {e}")
+
+    manifest = {
+        'version': version,
+        'models': [dict(meta, path=os.path.join(ticker_dirname(meta['ticker']), meta['target_type']))
+                   for meta in results.values()],
+        'failed': failed,
+    }
+    with open(os.path.join(run_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    # Serving follows LATEST, so only a run where every job trained replaces the previous one
+    if results and not failed:
+        with open(os.path.join(artifacts_dir, "LATEST"), "w") as f:
+            f.write(version)
+    else:
+        print(f"[WARN] {len(failed)} of {len(jobs)} training jobs failed; LATEST not updated to {version}")
+    return run_dir, results
+
+
+def run_training(tickers, target_types=TARGET_TYPES, start='2024-09-30', end='2025-06-02',
+                 sentiment_path=None, store=None, feature_version=None, feature_root=None, **kwargs):
+    # feature_version: read each ticker's frames from that feature-store version ("latest" for
+    # the newest) when it has one, instead of downloading and recomputing them
+    from Pipeline.market_data import get_prices
+    from Pipeline.pipeline import SENTIMENT_PATH, load_sentiment
+
+    with stage("load_sentiment") as record:
+        sentiment_df = load_sentiment(sentiment_path or SENTIMENT_PATH, start, end)
+        record['items'] = len(sentiment_df)
+    frames_by_ticker = {}
+    for ticker in tickers:
+        if feature_version:
+            from Pipeline.feature_store import FEATURE_STORE_DIR, FeatureStore, load_target_frames
+            try:
+                with stage(f"{ticker}/load_features") as record:
+                    frames_by_ticker[ticker] = load_target_frames(ticker, target_types, start, end, feature_version,
+                                                                  FeatureStore(feature_root or FEATURE_STORE_DIR))
+                    record['items'] = sum(len(f[0]) for f in frames_by_ticker[ticker].values())
+                continue
+            except (FileNotFoundError, KeyError) as e:
+                print(f"[WARN] No stored features for {ticker} ({e}), computing them")
+        with stage(f"{ticker}/download") as record:
+            raw_data = get_prices(ticker, start, end, store=store)
+            record['items'] = len(raw_data)
+        if raw_data.empty:
+            print(f"[WARN] No price data for {ticker}, skipping")
+            continue
+        with stage(f"{ticker}/engineer_features", items=len(raw_data) * len(target_types)):
+            frames_by_ticker[ticker] = build_target_frames(raw_data, sentiment_df, target_types)
+    return train_frames(frames_by_ticker, **kwargs)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Train direction models for tickers x target types")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--targets", nargs="+", default=TARGET_TYPES, choices=TARGET_TYPES)
+    parser.add_argument("--start", default='2024-09-30')
+    parser.add_argument("--end", default='2025-06-02')
+    parser.add_argument("--min-date", default='2024-12-31')
+    parser.add_argument("--sentiment-path")
+    parser.add_argument("--version")
+    parser.add_argument("--artifacts-dir", default=ARTIFACTS_DIR)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--tf-threads", type=int, default=1)
+    parser.add_argument("--epochs", type=int, default=25)
+    parser.add_argument("--feature-version", help="Read frames from this feature-store version ('latest' for the newest)")
+    parser.add_argument("--feature-root", help="Feature store directory (default data/features)")
+    parser.add_argument("--profile", action="append", default=[], metavar="STAGE",
+                        help="Profile this stage ('*' for all), once per stage; stage names as in the run report")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default="cprofile")
+    parser.add_argument("--report", help="Run report path (default reports/train-<time>.json)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    start_run("train", args.profile, profiler=args.profiler)
+    run_dir, results = run_training(args.tickers, args.targets, args.start, args.end,
+                                    sentiment_path=args.sentiment_path, version=args.version,
+                                    feature_version=args.feature_version, feature_root=args.feature_root,
+                                    artifacts_dir=args.artifacts_dir, max_workers=args.workers,
+                                    tf_threads=args.tf_threads, epochs=args.epochs, min_date=args.min_date)
+    print(f"\nSaved {len(results)} models to {run_dir}")
+    finish_run(args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,36 @@
-import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import yfinance as yf
-import pandas_ta as ta
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import (
-    classification_report, confusion_matrix, ConfusionMatrixDisplay,
-    f1_score, roc_curve, auc, precision_recall_curve, average_precision_score
-)
-from tensorflow.keras.models import Model, load_model
-from tensorflow.keras.layers import Input, LSTM, Dense, Dropout, Bidirectional
-from tensorflow.keras.optimizers import Adam
 import os
+import time
 import warnings
 
+from Pipeline.indicators import INDICATOR_COLUMNS, add_indicators
+from Pipeline.market_data import get_prices
+from Pipeline.profiling import finish_run, stage, start_run
+from Pipeline.sentiment_store import SENTIMENT_COLUMNS, SENTIMENT_DB_PATH, open_sentiment_store
+from Pipeline.windowing import build_windows
+
+# sklearn, TensorFlow and the training/bundle modules are imported inside the functions that
+# use them, so feature and data steps start without paying for them
+
 warnings.filterwarnings("ignore")
 
 MODEL_PATH = "lstm_model.h5"
+SENTIMENT_PATH = SENTIMENT_DB_PATH
+ANALYSIS_DB_URL = os.environ.get("ANALYSIS_DB_URL")  # e.g. sqlite:///../api_finvisor/database/database.sqlite
+FEATURE_VERSION = os.environ.get("FEATURE_VERSION")  # feature-store version to train from, e.g. "latest"
+FEATURE_COLUMNS = ['High', 'Low', 'Open', 'Volume', 'RSI', 'EMAF', 'EMAM', 'EMAS', 'avg_sentiment']
 
-def load_data():
-    data = yf.download(tickers='^NDX', start = '2024-09-30',end = '2025-06-02')
-    data.columns = [f"{col[0]}" for col in data.columns]
-    return data
+def load_data(store=None):
+    return get_prices('^NDX', '2024-09-30', '2025-06-02', store=store)
 
 
 def engineer_features(data,target_type):
-    data=data.copy()
-    data['RSI']=ta.rsi(data.Close, length=15)
-    data['EMAF']=ta.ema(data.Close, length=20)
-    data['EMAM']=ta.ema(data.Close, length=100)
-    data['EMAS']=ta.ema(data.Close, length=150)
-    indicator_cols = ['RSI', 'EMAF', 'EMAM', 'EMAS']
-    data[indicator_cols] = data[indicator_cols].fillna(method='bfill')
+    # Indicators are target-independent: reuse them when the caller already added them once
+    if set(INDICATOR_COLUMNS).issubset(data.columns):
+        data=data.copy()
+    else:
+        data=add_indicators(data)
+    data[INDICATOR_COLUMNS] = data[INDICATOR_COLUMNS].fillna(method='bfill')
     data['Adj Close'] = data[('Close')]
 
 
@@ -70,29 +68,53 @@ def engineer_features(data,target_type):
     return data, target_column, horizon
 
 
-def merge_sentiment(data, sentiment_path):
+def load_sentiment(sentiment_path=SENTIMENT_PATH, start=None, end=None):
+    # Daily aggregates for [start, end] from the sentiment store; a .csv path is read the old way
+    if not sentiment_path.endswith(".csv"):
+        return open_sentiment_store(sentiment_path).daily(start, end)
     sentiment_df = pd.read_csv(sentiment_path, parse_dates=["date"])
     sentiment_df.rename(columns={'date': 'Date'}, inplace=True)
+    if start is not None:
+        sentiment_df = sentiment_df[sentiment_df['Date'] >= pd.Timestamp(start)]
+    if end is not None:
+        sentiment_df = sentiment_df[sentiment_df['Date'] <= pd.Timestamp(end)]
+    return sentiment_df.reset_index(drop=True)
+
+
+def merge_sentiment_frame(data, sentiment_df):
     data = pd.merge(data, sentiment_df, how='left', on='Date')
-    data[['avg_sentiment', 'avg_score', 'article_count']] = data[['avg_sentiment', 'avg_score', 'article_count']].fillna(method='ffill')
+    columns = [c for c in SENTIMENT_COLUMNS if c in data.columns]
+    data[columns] = data[columns].fillna(method='ffill')
     return data
 
 
-def prepare_dataset(data, target_column, backcandles=15, horizon=1):
+def merge_sentiment(data, sentiment_path=SENTIMENT_PATH):
+    # Only the days the price frame covers are read
+    return merge_sentiment_frame(data, load_sentiment(sentiment_path, data['Date'].min(), data['Date'].max()))
+
+
+def dataset_frame(data, horizon=1, min_date='2024-12-31'):
     data = data.iloc[:-horizon]  # Remove future-leaking samples
-    data = data[data['Date'] > pd.to_datetime('2024-12-31')].reset_index(drop=True)
-    feature_columns = ['High', 'Low', 'Open', 'Volume', 'RSI', 'EMAF', 'EMAM', 'EMAS', 'avg_sentiment']
-    X, y = [], data[target_column].values[backcandles:]
-    for j in range(len(feature_columns)):
-        X.append([data[feature_columns].iloc[i-backcandles:i, j].values for i in range(backcandles, len(data))])
-    X = np.moveaxis(X, [0], [2])
-    return np.array(X), y, feature_columns
+    return data[data['Date'] > pd.to_datetime(min_date)].reset_index(drop=True)
+
+
+def prepare_dataset(data, target_column, backcandles=15, horizon=1, materialize=False, min_date='2024-12-31',
+                    return_rows=False):
+    data = dataset_frame(data, horizon, min_date)
+    feature_columns = list(FEATURE_COLUMNS)
+    y = data[target_column].values[backcandles:]
+    X = build_windows(data, feature_columns, backcandles, materialize=materialize)
+    if return_rows:
+        # The frame row each sample is labelled from, e.g. for its date
+        return X, y, feature_columns, data.iloc[backcandles:].reset_index(drop=True)
+    return X, y, feature_columns
 
 
 def scale_dataset(X, scaler=None):
     orig_shape = X.shape
     X_reshaped = X.reshape(-1, orig_shape[2])
     if scaler is None:
+        from sklearn.preprocessing import StandardScaler
         scaler = StandardScaler()
         X_scaled = scaler.fit_transform(X_reshaped)
     else:
@@ -101,6 +123,8 @@ def scale_dataset(X, scaler=None):
     return X_scaled, scaler
 
 def scale_and_split(X, y):
+    from sklearn.model_selection import train_test_split
+
     X_train, X_test, y_train, y_test = train_test_split(X, y,
                                                         test_size=0.2,
                                                         stratify=y,
@@ -111,6 +135,10 @@ def scale_and_split(X, y):
 
 
 def build_lstm_model(input_shape):
+    from tensorflow.keras.models import Model
+    from tensorflow.keras.layers import Input, LSTM, Dense, Dropout, Bidirectional
+    from tensorflow.keras.optimizers import Adam
+
     inputs = Input(shape=input_shape)
     x = Bidirectional(LSTM(100, return_sequences=True))(inputs)
     x = Dropout(0.3)(x)
@@ -125,57 +153,28 @@ def build_lstm_model(input_shape):
     return model
 
 
-def evaluate_model(model, X_test, y_test):
-    y_prob = model.predict(X_test).flatten()
-    thresholds = np.linspace(0, 1, 101)
-    f1_scores = [f1_score(y_test, (y_prob >= t).astype(int)) for t in thresholds]
-    best_t = thresholds[np.argmax(f1_scores)]
-    print(f"Best threshold = {best_t:.2f}, F1 = {max(f1_scores):.4f}")
+def evaluate_model(model, X_test, y_test, output_dir=None, plots=False):
+    # Headless: metrics.json (and PNG plots if asked) go to output_dir instead of plt.show()
+    from sklearn.metrics import classification_report
+    from Pipeline.evaluation import evaluate_predictions
+
+    started_at = time.perf_counter()
+    y_prob = model.predict(X_test, verbose=0).flatten()
+    metrics = evaluate_predictions(y_test, y_prob, output_dir=output_dir, plots=plots, started_at=started_at)
+    best_t = metrics['best_threshold']
+    print(f"Best threshold = {best_t:.2f}, F1 = {metrics['f1']:.4f}")
 
     # Classification
     y_pred = (y_prob >= best_t).astype(int)
     print(classification_report(y_test, y_pred))
-    ConfusionMatrixDisplay(confusion_matrix(y_test, y_pred)).plot(cmap='Blues')
-    plt.title("Confusion Matrix")
-    plt.show()
-
-    # ROC Curve
-    fpr, tpr, _ = roc_curve(y_test, y_prob)
-    roc_auc = auc(fpr, tpr)
-    plt.plot(fpr, tpr, label=f'AUC = {roc_auc:.2f}')
-    plt.plot([0, 1], [0, 1], 'k--')
-    plt.xlabel('False Positive Rate')
-    plt.ylabel('True Positive Rate')
-    plt.title('ROC Curve')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
-
-    # Precision-Recall Curve
-    precision, recall, _ = precision_recall_curve(y_test, y_prob)
-    pr_auc = average_precision_score(y_test, y_prob)
-    plt.plot(recall, precision, label=f'AP = {pr_auc:.2f}')
-    plt.xlabel('Recall')
-    plt.ylabel('Precision')
-    plt.title('Precision-Recall Curve')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
-
-    # Distribution of Labels
-    unique, counts = np.unique(y_test, return_counts=True)
-    print("Label distribution in test set:", dict(zip(unique, counts)))
+    print("Label distribution in test set:", metrics['label_distribution'])
+    print(f"Evaluation took {metrics['eval_seconds']:.3f}s")
     return best_t
 
-def prepare_full_dataset_for_prediction(data, backcandles=15):
+def prepare_full_dataset_for_prediction(data, backcandles=15, materialize=False):
     # Prepare the features without target, for prediction on full dataset (starting from date index after backcandles)
-    feature_columns = ['High', 'Low', 'Open', 'Volume', 'RSI', 'EMAF', 'EMAM', 'EMAS', 'avg_sentiment']
     data = data.reset_index(drop=True)
-    X = []
-    for j in range(len(feature_columns)):
-        X.append([data[feature_columns].iloc[i-backcandles:i, j].values for i in range(backcandles, len(data))])
-    X = np.moveaxis(X, [0], [2])
-    return np.array(X)
+    return build_windows(data, FEATURE_COLUMNS, backcandles, materialize=materialize)
 
 def predict_direction(model, scaler, data, backcandles=15, threshold=0.5):
     X_full = prepare_full_dataset_for_prediction(data, backcandles)
@@ -188,39 +187,50 @@ def predict_direction(model, scaler, data, backcandles=15, threshold=0.5):
 
 
 def main():
-    raw_data = load_data()
-
-    sentiment_path = "data/cleaned_scores.csv"
-    sentiment_df = pd.read_csv(sentiment_path, parse_dates=["date"])
-    sentiment_df.rename(columns={'date': 'Date'}, inplace=True)
+    from Pipeline.bundle import BUNDLE_NAME, load_bundle
+    from Pipeline.orchestrator import TARGET_TYPES, build_target_frames, ticker_dirname, train_frames
+
+    start_run("pipeline")
+    # One training job per target type, run in parallel by the orchestrator
+    target_types = TARGET_TYPES
+    if FEATURE_VERSION:
+        from Pipeline.feature_store import load_target_frames
+        with stage("load_features"):
+            frames = load_target_frames('^NDX', target_types, '2024-09-30', '2025-06-02', FEATURE_VERSION)
+        with stage("load_sentiment") as record:
+            sentiment_df = load_sentiment(SENTIMENT_PATH, '2024-09-30', '2025-06-02')
+            record['items'] = len(sentiment_df)
+    else:
+        with stage("download") as record:
+            raw_data = load_data()
+            record['items'] = len(raw_data)
+        with stage("indicators", items=len(raw_data)):
+            raw_data = add_indicators(raw_data)
+        with stage("load_sentiment") as record:
+            sentiment_df = load_sentiment(SENTIMENT_PATH, raw_data.index.min(), raw_data.index.max())
+            record['items'] = len(sentiment_df)
+        with stage("engineer_features", items=len(raw_data) * len(target_types)):
+            frames = build_target_frames(raw_data, sentiment_df, target_types)
+    run_dir, results = train_frames({'^NDX': frames}, epochs=25, batch_size=32, backcandles=15)
+    failed = [t for t in target_types if ('^NDX', t) not in results]
+    if failed:
+        print(f"[WARN] No trained model for {', '.join(failed)}; leaving those predictions out")
+        target_types = [t for t in target_types if t not in failed]
+    if not target_types:
+        print(f"[ERROR] Training failed for every target type, see {run_dir}")
+        finish_run()
+        return 1
 
-    target_types = ['daily', 'weekly', 'monthly']
     models = {}
     scalers = {}
     thresholds = {}
-    data_dict = {}
-
-    # Store data with engineered features for each target
-    for target_type in target_types:
-        print(f"\n--- Processing target: {target_type} ---")
-        data, target_column, horizon = engineer_features(raw_data, target_type)
-        data = pd.merge(data, sentiment_df, how='left', on='Date')
-        data[['avg_sentiment', 'avg_score', 'article_count']] = data[['avg_sentiment', 'avg_score', 'article_count']].fillna(method='ffill')
-        
-        X, y, _ = prepare_dataset(data, target_column=target_column, backcandles=15, horizon=horizon)
-        X_train, X_test, y_train, y_test, scaler = scale_and_split(X, y)
-        model = build_lstm_model((X.shape[1], X.shape[2]))
-        model.fit(X_train, y_train, epochs=25, batch_size=32, validation_split=0.1, verbose=1, shuffle=True)
-
-        best_t = evaluate_model(model, X_test, y_test)
-
-        os.makedirs("models", exist_ok=True)
-        model.save(f"models/lstm_model_{target_type}.h5")
-
-        models[target_type] = model
-        scalers[target_type] = scaler
-        thresholds[target_type] = best_t
-        data_dict[target_type] = data
+    data_dict = {target_type: frames[target_type][0] for target_type in frames}
+    with stage("load_bundles", items=len(target_types), unit="models"):
+        for target_type in target_types:
+            bundle = load_bundle(os.path.join(run_dir, ticker_dirname('^NDX'), target_type, BUNDLE_NAME))
+            models[target_type] = bundle.model
+            scalers[target_type] = bundle.scaler
+            thresholds[target_type] = bundle.threshold
 
     # Now produce predictions for the date range 2025-01-01 to 2025-06-01
     start_date = pd.to_datetime("2025-01-01")
@@ -238,7 +248,8 @@ def main():
 
     for target_type in target_types:
         data_full = data_dict[target_type]
-        pred_df = predict_direction(models[target_type], scalers[target_type], data_full, backcandles=15, threshold=thresholds[target_type])
+        with stage(f"{target_type}/predict_direction", items=len(data_full)):
+            pred_df = predict_direction(models[target_type], scalers[target_type], data_full, backcandles=15, threshold=thresholds[target_type])
         # Filter predictions for date range
         pred_df = pred_df[(pred_df['Date'] >= start_date) & (pred_df['Date'] <= end_date)].reset_index(drop=True)
         colname = f"{target_type}_direction_prediction"
@@ -254,6 +265,11 @@ def main():
     output_path = "prediction_summary_2025-01-01_to_2025-06-01.csv"
     results_df.to_csv(output_path, index=False)
     print(f"\nSaved prediction summary to {output_path}")
+    if ANALYSIS_DB_URL:
+        from Pipeline.analysis_export import export_summary
+        with stage("analysis_export", items=len(results_df)):
+            export_summary(results_df, ANALYSIS_DB_URL)
+    finish_run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
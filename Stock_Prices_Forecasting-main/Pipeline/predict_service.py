@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from Pipeline.bundle import BUNDLE_NAME, load_bundle
+from Pipeline.indicators import INDICATOR_COLUMNS, add_indicators
+from Pipeline.market_data import get_prices
+from Pipeline.orchestrator import ARTIFACTS_DIR
+from Pipeline.pipeline import SENTIMENT_PATH, load_sentiment, merge_sentiment_frame
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+HISTORY_DAYS = 365  # calendar days of history loaded before a query so the EMAs are warm
+
+
+def resolve_run_dir(artifacts_dir=ARTIFACTS_DIR, version=None):
+    if version is None:
+        with open(os.path.join(artifacts_dir, "LATEST")) as f:
+            version = f.read().strip()
+    return os.path.join(artifacts_dir, version)
+
+
+class PredictionService:
+    # Keeps every bundle of one training run loaded and answers batched direction queries
+    def __init__(self, run_dir, sentiment_path=SENTIMENT_PATH, store=None, history_days=HISTORY_DAYS, runtime="keras"):
+        self.run_dir = run_dir
+        self.runtime = runtime
+        self.sentiment_path = sentiment_path
+        self.store = store
+        self.history_days = history_days
+        self.lock = threading.Lock()
+        self.predict_lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        with open(os.path.join(self.run_dir, "manifest.json")) as f:
+            manifest = json.load(f)
+        bundles = {}
+        for entry in manifest['models']:
+            path = os.path.join(self.run_dir, entry['path'], BUNDLE_NAME)
+            bundles[(entry['ticker'], entry['target_type'])] = load_bundle(path, runtime=self.runtime)
+        sentiment_df = load_sentiment(self.sentiment_path)
+        with self.lock:
+            self.version = manifest['version']
+            self.bundles = bundles
+            self.sentiment_df = sentiment_df
+
+    def feature_frame(self, ticker, start, end):
+        # Same columns engineer_features produces, minus targets, so the last bars stay predictable
+        raw_data = get_prices(ticker, start - timedelta(days=self.history_days), end + timedelta(days=1), store=self.store)
+        data = add_indicators(raw_data)
+        data[INDICATOR_COLUMNS] = data[INDICATOR_COLUMNS].fillna(method='bfill')
+        return merge_sentiment_frame(data.reset_index(), self.sentiment_df)
+
+    def predict(self, queries):
+        # queries: [{"ticker": "^NDX", "date": "2025-05-01", "target_types": [...]}, ...]
+        with self.lock:
+            bundles, version = self.bundles, self.version
+        results = [{'ticker': q['ticker'], 'date': q['date'], 'directions': {}, 'errors': {}} for q in queries]
+
+        by_ticker = {}
+        for i, q in enumerate(queries):
+            by_ticker.setdefault(q['ticker'], []).append(i)
+
+        for ticker, indices in by_ticker.items():
+            available = [tt for (tk, tt) in bundles if tk == ticker]
+            if not available:
+                for i in indices:
+                    results[i]['errors']['*'] = "No models for ticker"
+                continue
+            dates = pd.to_datetime([queries[i]['date'] for i in indices])
+            try:
+                data = self.feature_frame(ticker, dates.min(), dates.max())
+            except Exception as e:
+                for i in indices:
+                    results[i]['errors']['*'] = f"Failed loading data: {e}"
+                continue
+
+            wanted = {i: queries[i].get('target_types') or available for i in indices}
+            for target_type in set().union(*wanted.values()):
+                bundle = bundles.get((ticker, target_type))
+                asking = [i for i in indices if target_type in wanted[i]]
+                if bundle is None:
+                    for i in asking:
+                        results[i]['errors'][target_type] = "No model for ticker and target type"
+                    continue
+                # One batched model call per (ticker, target type)
+                with self.predict_lock:
+                    preds = bundle.predict_frame(data).set_index('Date')
+                for i in asking:
+                    date = pd.Timestamp(queries[i]['date'])
+                    if date not in preds.index:
+                        results[i]['errors'][target_type] = "No trading data for date"
+                        continue
+                    row = preds.loc[date]
+                    results[i]['directions'][target_type] = {
+                        'prediction': int(row['Prediction']),
+                        'probability': float(row['Probability']),
+                        'threshold': bundle.threshold,
+                    }
+        return {'version': version, 'results': results}
+
+
+def make_handler(service):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {'status': 'ok', 'version': service.version,
+                                 'models': sorted(f"{t}/{h}" for t, h in service.bundles)})
+            else:
+                self._send(404, {'error': 'Not found'})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/predict":
+                    self._send(200, service.predict(payload.get('queries', [])))
+                elif self.path == "/reload":
+                    service.reload()
+                    self._send(200, {'status': 'ok', 'version': service.version})
+                else:
+                    self._send(404, {'error': 'Not found'})
+            except (ValueError, KeyError) as e:
+                self._send(400, {'error': str(e)})
+            except Exception as e:
+                # e.g. a missing manifest on /reload; the loaded models stay in service
+                print(f"[ERROR] {self.path} failed: {type(e).__name__}: {e}")
+                self._send(500, {'error': f"{type(e).__name__}: {e}"})
+
+    return PredictionHandler
+
+
+def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"[INFO] Serving {len(service.bundles)} models from {service.run_dir} on http://{host}:{port}")
+    server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve direction predictions from warm model bundles")
+    parser.add_argument("--artifacts-dir", default=ARTIFACTS_DIR)
+    parser.add_argument("--version")
+    parser.add_argument("--sentiment-path", default=SENTIMENT_PATH)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--runtime", choices=["keras", "numpy"], default="keras")
+    args = parser.parse_args(argv)
+
+    service = PredictionService(resolve_run_dir(args.artifacts_dir, args.version), args.sentiment_path,
+                                runtime=args.runtime)
+    serve(service, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import json
+import os
+import platform
+import re
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+REPORTS_DIR = "reports"
+
+# Stage timing for whole runs: `start_run` once per process, `with stage(...)` around the hot
+# paths, `finish_run` writes a JSON report. With no run started, stage() only yields its record.
+
+_active = None
+
+
+def peak_rss_mb():
+    # Peak resident set size of this process so far (resource is Unix-only)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10  # bytes on macOS, kB on Linux
+
+
+class RunReport:
+    def __init__(self, name, profile=(), profile_dir=None, profiler="cprofile"):
+        # profile: stage names to run under a profiler ("*" for all)
+        self.name = name
+        self.started_at = datetime.now()
+        self.profile = set(profile or ())
+        self.profile_dir = profile_dir or os.path.join(REPORTS_DIR, "profiles")
+        self.profiler = profiler
+        self.stages = []
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def _start_profiler(self, name):
+        # A bare stage name matches it under any prefix: "fit" profiles every "<ticker>/<target>/fit"
+        if not self.profile.intersection({"*", name, name.rsplit("/", 1)[-1]}):
+            return None
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                profiler = Profiler()
+                profiler.start()
+                return profiler
+            except ImportError:
+                print("[WARN] pyinstrument is not installed, using cProfile")
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, profiler, name):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        stem = os.path.join(self.profile_dir, f"{self.name}-{self.started_at:%Y%m%d-%H%M%S}-{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}")
+        if hasattr(profiler, "output_html"):
+            profiler.stop()
+            path = stem + ".html"
+            with open(path, "w") as f:
+                f.write(profiler.output_html())
+        else:
+            profiler.disable()
+            path = stem + ".prof"
+            profiler.dump_stats(path)  # snakeviz / pstats
+        return path
+
+    @contextmanager
+    def stage(self, name, items=None, unit="rows"):
+        # Set record['items'] inside the block when the count is only known afterwards
+        record = {'stage': name, 'items': items, 'unit': unit}
+        profiler = self._start_profiler(name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall
+            record['cpu_seconds'] = time.process_time() - cpu
+            record['peak_rss_mb'] = peak_rss_mb()
+            if record['items'] and record['wall_seconds'] > 0:
+                record['items_per_second'] = record['items'] / record['wall_seconds']
+            if profiler is not None:
+                record['profile'] = self._stop_profiler(profiler, name)
+            self.stages.append(record)
+
+    def add_stages(self, stages, prefix):
+        # Stages measured in another process, e.g. a training worker
+        self.stages.extend(dict(s, stage=f"{prefix}/{s['stage']}") for s in stages)
+
+    def to_dict(self):
+        return {
+            'run': self.name,
+            'started_at': self.started_at.isoformat(timespec="seconds"),
+            'wall_seconds': time.perf_counter() - self._wall,
+            'cpu_seconds': time.process_time() - self._cpu,
+            'peak_rss_mb': peak_rss_mb(),
+            'host': platform.node(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'argv': sys.argv,
+            'stages': self.stages,
+        }
+
+    def save(self, path=None):
+        path = path or os.path.join(REPORTS_DIR, f"{self.name}-{self.started_at:%Y%m%d-%H%M%S}.json")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return path
+
+    def print_summary(self):
+        for s in self.stages:
+            rate = f" {s['items_per_second']:,.4g} {s['unit']}/s" if s.get('items_per_second') else ""
+            print(f"[INFO] {s['stage']:<32} wall={s['wall_seconds']:8.3f}s cpu={s['cpu_seconds']:8.3f}s{rate}")
+
+
+def start_run(name, profile=(), profile_dir=None, profiler="cprofile"):
+    global _active
+    _active = RunReport(name, profile, profile_dir, profiler)
+    return _active
+
+
+def current_run():
+    return _active
+
+
+def finish_run(path=None, quiet=False):
+    # Writes the active run's report and returns its path (None if no run was started)
+    global _active
+    report, _active = _active, None
+    if report is None:
+        return None
+    if not quiet:
+        report.print_summary()
+    path = report.save(path)
+    if not quiet:
+        print(f"[INFO] Run report written to {path}")
+    return path
+
+
+@contextmanager
+def stage(name, items=None, unit="rows"):
+    if _active is None:
+        yield {'stage': name, 'items': items, 'unit': unit}
+    else:
+        with _active.stage(name, items, unit) as record:
+            yield record
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+SENTIMENT_DB_PATH = "data/sentiment.sqlite"
+LEGACY_SENTIMENT_PATH = "data/cleaned_scores.csv"
+SENTIMENT_COLUMNS = ['avg_sentiment', 'avg_score', 'article_count', 'weighted_sentiment']
+
+
+def article_ids(df):
+    # The URL when the feed has one, otherwise publication date + source + title
+    if 'url' in df.columns:
+        keys = df['url'].astype(str)
+    else:
+        keys = (df['publishedAt'].astype(str) + "|" + df.get('source', pd.Series("", index=df.index)).astype(str)
+                + "|" + df['title'].fillna("").astype(str))
+    return [hashlib.sha1(k.encode("utf-8")).hexdigest() for k in keys]
+
+
+class SentimentStore:
+    # Per-article scores plus running per-day sums (count, sentiment, score, score * sentiment),
+    # updated in the same transaction as the articles, so a date-range read never rescans articles.
+    # `sentiment` is the article's direction (e.g. FinBERT label as -1/0/1, or a VADER compound),
+    # `score` its confidence; avg_* are plain means and weighted_sentiment is confidence-weighted.
+    # Pre-aggregated days (the legacy CSV) live in imported_daily, keyed by date; a day that has
+    # ingested articles is served from those instead.
+    def __init__(self, path=SENTIMENT_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS articles ("
+                              "article_id TEXT PRIMARY KEY, date TEXT NOT NULL, "
+                              "sentiment REAL NOT NULL, score REAL NOT NULL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS articles_date ON articles (date)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS daily ("
+                              "date TEXT PRIMARY KEY, n REAL NOT NULL, sentiment_sum REAL NOT NULL, "
+                              "score_sum REAL NOT NULL, weighted_sum REAL NOT NULL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS imported_daily ("
+                              "date TEXT PRIMARY KEY, n REAL NOT NULL, sentiment_sum REAL NOT NULL, "
+                              "score_sum REAL NOT NULL, weighted_sum REAL NOT NULL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def _existing(self, ids):
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows += self.conn.execute(
+                f"SELECT article_id, date, sentiment, score FROM articles WHERE article_id IN ({','.join('?' * len(chunk))})",
+                chunk).fetchall()
+        return pd.DataFrame(rows, columns=['article_id', 'date', 'sentiment', 'score']).astype({'sentiment': float, 'score': float})
+
+    @staticmethod
+    def _sums(df, sign):
+        return pd.DataFrame({'date': df['date'], 'n': sign, 'sentiment_sum': sign * df['sentiment'],
+                             'score_sum': sign * df['score'], 'weighted_sum': sign * df['score'] * df['sentiment']})
+
+    def _apply_deltas(self, deltas):
+        deltas = deltas.groupby('date', as_index=False).sum()
+        self.conn.executemany(
+            "INSERT INTO daily VALUES (?, ?, ?, ?, ?) ON CONFLICT(date) DO UPDATE SET "
+            "n = n + excluded.n, sentiment_sum = sentiment_sum + excluded.sentiment_sum, "
+            "score_sum = score_sum + excluded.score_sum, weighted_sum = weighted_sum + excluded.weighted_sum",
+            deltas[['date', 'n', 'sentiment_sum', 'score_sum', 'weighted_sum']].itertuples(index=False, name=None))
+        self.conn.execute("DELETE FROM daily WHERE n < 0.5")
+
+    def upsert_articles(self, articles):
+        # articles: article_id, date, sentiment and optionally score (default 1.0).
+        # Returns how many articles were new or changed; unchanged ones cost nothing.
+        if articles.empty:
+            return 0
+        new = pd.DataFrame({
+            'article_id': articles['article_id'].astype(str),
+            'date': pd.to_datetime(articles['date']).dt.strftime("%Y-%m-%d"),
+            'sentiment': articles['sentiment'].astype(float),
+            'score': articles['score'].astype(float) if 'score' in articles.columns else 1.0,
+        }).drop_duplicates('article_id', keep='last')
+
+        with self.conn:
+            old = self._existing(new['article_id'].tolist())
+            merged = new.merge(old, on='article_id', how='left', suffixes=('', '_old'))
+            same = ((merged['date'] == merged['date_old']) & np.isclose(merged['sentiment'], merged['sentiment_old'])
+                    & np.isclose(merged['score'], merged['score_old']))
+            changed = new[~same.to_numpy()]
+            replaced = old[old['article_id'].isin(changed['article_id'])]
+            if changed.empty:
+                return 0
+            self.conn.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?)",
+                                  changed.itertuples(index=False, name=None))
+            self._apply_deltas(pd.concat([self._sums(changed, 1.0), self._sums(replaced, -1.0)]))
+        return len(changed)
+
+    def import_daily(self, daily):
+        # Pre-aggregated days (the cleaned_scores.csv layout), upserted by date, so importing the
+        # same days again replaces them. Means and counts are kept exactly; with no per-article
+        # confidences, weighted_sentiment falls back to avg_sentiment.
+        daily = daily.rename(columns={'Date': 'date'})
+        n = daily['article_count'].astype(float)
+        days = pd.DataFrame({
+            'date': pd.to_datetime(daily['date']).dt.strftime("%Y-%m-%d"),
+            'n': n,
+            'sentiment_sum': daily['avg_sentiment'] * n,
+            'score_sum': daily['avg_score'] * n,
+            'weighted_sum': daily['avg_sentiment'] * daily['avg_score'] * n,
+        }).dropna().drop_duplicates('date', keep='last')
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO imported_daily VALUES (?, ?, ?, ?, ?)",
+                                  days.itertuples(index=False, name=None))
+            self.conn.execute("DELETE FROM imported_daily WHERE n < 0.5")
+        return len(days)
+
+    def daily(self, start=None, end=None):
+        # Inclusive date range over the daily primary key
+        query = ("SELECT date, sentiment_sum / n, score_sum / n, n, "
+                 "CASE WHEN score_sum != 0 THEN weighted_sum / score_sum END FROM ("
+                 "SELECT * FROM daily UNION ALL "
+                 "SELECT * FROM imported_daily WHERE date NOT IN (SELECT date FROM daily))")
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(pd.Timestamp(start).strftime("%Y-%m-%d"))
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(pd.Timestamp(end).strftime("%Y-%m-%d"))
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        rows = self.conn.execute(query + " ORDER BY date", params).fetchall()
+        df = pd.DataFrame(rows, columns=['Date'] + SENTIMENT_COLUMNS)
+        df['Date'] = pd.to_datetime(df['Date'])
+        df['article_count'] = df['article_count'].round().astype(int)
+        return df
+
+
+def open_sentiment_store(path=SENTIMENT_DB_PATH, legacy_path=LEGACY_SENTIMENT_PATH):
+    # The legacy CSV, if there is one, is imported again whenever it changed since the last import
+    store = SentimentStore(path)
+    if legacy_path and os.path.exists(legacy_path):
+        stat = os.stat(legacy_path)
+        stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+        key = f"imported:{os.path.abspath(legacy_path)}"
+        if store.get_meta(key) != stamp:
+            n_days = store.import_daily(pd.read_csv(legacy_path, parse_dates=["date"]))
+            store.set_meta(key, stamp)
+            print(f"[INFO] Imported {n_days} days from {legacy_path} into {path}")
+    return store
@@ -0,0 +1,127 @@
+import json
+import os
+
+import numpy as np
+
+from Pipeline.orchestrator import ticker_dirname
+
+SHARDS_DIR = "data/shards"
+
+
+def write_shards(frames, out_dir=SHARDS_DIR, backcandles=15, min_date='2024-12-31'):
+    # One float32 row matrix and one label vector per frame; windows are never materialized.
+    # frames: {name: (data, target_column, horizon)}, e.g. one entry per ticker.
+    from Pipeline.pipeline import FEATURE_COLUMNS, dataset_frame
+
+    os.makedirs(out_dir, exist_ok=True)
+    shards = []
+    for name, (data, target_column, horizon) in frames.items():
+        rows = dataset_frame(data, horizon, min_date)
+        if len(rows) <= backcandles:
+            print(f"[WARN] Not enough rows for {name}, skipping")
+            continue
+        stem = ticker_dirname(name)
+        np.save(os.path.join(out_dir, f"{stem}_features.npy"), rows[FEATURE_COLUMNS].to_numpy(dtype=np.float32))
+        np.save(os.path.join(out_dir, f"{stem}_labels.npy"), rows[target_column].to_numpy(dtype=np.float32))
+        shards.append({'name': name, 'stem': stem, 'n_rows': len(rows)})
+
+    manifest = {'backcandles': backcandles, 'feature_columns': list(FEATURE_COLUMNS), 'shards': shards}
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return ShardSet(out_dir)
+
+
+class ShardSet:
+    # Memory-mapped shards; a sample is (shard id, end row): window rows end-backcandles .. end-1,
+    # label at row end - the same pairing as prepare_dataset
+    def __init__(self, shard_dir=SHARDS_DIR):
+        with open(os.path.join(shard_dir, "manifest.json")) as f:
+            manifest = json.load(f)
+        self.backcandles = manifest['backcandles']
+        self.feature_columns = manifest['feature_columns']
+        self.names = [s['name'] for s in manifest['shards']]
+        self.features = [np.load(os.path.join(shard_dir, f"{s['stem']}_features.npy"), mmap_mode='r')
+                         for s in manifest['shards']]
+        self.labels = [np.load(os.path.join(shard_dir, f"{s['stem']}_labels.npy"), mmap_mode='r')
+                       for s in manifest['shards']]
+
+    def samples(self):
+        return np.concatenate([
+            np.column_stack([np.full(len(f) - self.backcandles, i), np.arange(self.backcandles, len(f))])
+            for i, f in enumerate(self.features)
+        ]).astype(np.int64)
+
+    def split(self, samples, validation_fraction=0.1):
+        # Chronological per shard: the last fraction of each shard's samples is held out
+        train, validation = [], []
+        for i in range(len(self.features)):
+            own = samples[samples[:, 0] == i]
+            cut = int(len(own) * (1 - validation_fraction))
+            train.append(own[:cut])
+            validation.append(own[cut:])
+        return np.concatenate(train), np.concatenate(validation)
+
+    def windows(self, samples):
+        offsets = np.arange(-self.backcandles, 0)
+        X = np.empty((len(samples), self.backcandles, len(self.feature_columns)), dtype=np.float32)
+        y = np.empty(len(samples), dtype=np.float32)
+        for i in np.unique(samples[:, 0]):
+            mask = samples[:, 0] == i
+            ends = samples[mask, 1]
+            X[mask] = self.features[i][ends[:, None] + offsets]
+            y[mask] = self.labels[i][ends]
+        return X, y
+
+    def fit_scaler(self, samples):
+        # Same statistics as scale_dataset over the windows of `samples`, without building them:
+        # each row is weighted by how many of those windows contain it
+        from sklearn.preprocessing import StandardScaler
+
+        scaler = StandardScaler()
+        for i in np.unique(samples[:, 0]):
+            ends = samples[samples[:, 0] == i, 1]
+            coverage = np.zeros(len(self.features[i]) + 1)
+            np.add.at(coverage, ends - self.backcandles, 1)
+            np.add.at(coverage, ends, -1)
+            weights = np.cumsum(coverage)[:-1]
+            used = np.flatnonzero(weights)
+            scaler.partial_fit(np.asarray(self.features[i][used]), sample_weight=weights[used])
+        return scaler
+
+
+def make_dataset(shards, samples, scaler, batch_size=32, shuffle=True, seed=42):
+    # Only sample indices live in the tf.data graph; each batch of windows is gathered from the
+    # memory-mapped rows when it is needed, so memory scales with the batch, not the dataset
+    import tensorflow as tf
+
+    mean = tf.constant(scaler.mean_, dtype=tf.float32)
+    scale = tf.constant(scaler.scale_, dtype=tf.float32)
+    n_features = len(shards.feature_columns)
+
+    def load_batch(batch):
+        return shards.windows(batch)
+
+    def to_tensors(batch):
+        X, y = tf.numpy_function(load_batch, [batch], [tf.float32, tf.float32])
+        X = tf.ensure_shape(X, [None, shards.backcandles, n_features])
+        y = tf.ensure_shape(y, [None])
+        return (X - mean) / scale, y
+
+    dataset = tf.data.Dataset.from_tensor_slices(samples)
+    if shuffle:
+        dataset = dataset.shuffle(len(samples), seed=seed, reshuffle_each_iteration=True)
+    return (dataset.batch(batch_size)
+            .map(to_tensors, num_parallel_calls=tf.data.AUTOTUNE)
+            .prefetch(tf.data.AUTOTUNE))
+
+
+def train_streaming(shards, epochs=25, batch_size=32, validation_fraction=0.1, model=None):
+    from Pipeline.pipeline import build_lstm_model
+
+    train, validation = shards.split(shards.samples(), validation_fraction)
+    scaler = shards.fit_scaler(train)
+    model = model or build_lstm_model((shards.backcandles, len(shards.feature_columns)))
+    model.fit(make_dataset(shards, train, scaler, batch_size),
+              validation_data=make_dataset(shards, validation, scaler, batch_size, shuffle=False) if len(validation) else None,
+              epochs=epochs, verbose=1)
+    return model, scaler
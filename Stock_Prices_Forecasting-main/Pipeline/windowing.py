@@ -0,0 +1,20 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def build_windows(data, feature_columns, backcandles=15, materialize=False):
+    # One contiguous float32 block, windowed without copying:
+    # sample k holds rows k .. k+backcandles-1 and predicts row k+backcandles.
+    values = np.ascontiguousarray(data[feature_columns].to_numpy(dtype=np.float32))
+    n_samples = len(values) - backcandles
+    if n_samples <= 0:
+        return np.empty((0, backcandles, len(feature_columns)), dtype=np.float32)
+
+    # sliding_window_view yields (rows - backcandles + 1, features, backcandles);
+    # the last window has no following row, and the axes are swapped into
+    # the (samples, backcandles, features) layout the LSTM expects.
+    windows = sliding_window_view(values, backcandles, axis=0)[:n_samples]
+    windows = windows.transpose(0, 2, 1)
+    if materialize:
+        return np.ascontiguousarray(windows)
+    return windows
@@ -0,0 +1,41 @@
+import tempfile
+import time
+
+import numpy as np
+from sklearn.metrics import f1_score
+
+from Pipeline.evaluation import THRESHOLDS, evaluate_predictions, threshold_sweep
+
+
+def legacy_best_threshold(y_true, y_prob):
+    # The original evaluate_model loop, kept as the reference
+    f1_scores = [f1_score(y_true, (y_prob >= t).astype(int)) for t in THRESHOLDS]
+    return THRESHOLDS[np.argmax(f1_scores)], np.array(f1_scores)
+
+
+def main(sizes=(200, 2000, 20000), seed=0):
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        y_true = rng.integers(0, 2, n)
+        y_prob = np.clip(rng.normal(0.45 + 0.1 * y_true, 0.15), 0, 1).astype(np.float32)
+        y_prob[:n // 10] = np.round(y_prob[:n // 10], 2)  # exact ties with the threshold grid
+
+        start = time.perf_counter()
+        best_legacy, f1_legacy = legacy_best_threshold(y_true, y_prob)
+        t_legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sweep = threshold_sweep(y_true, y_prob)
+        t_sweep = time.perf_counter() - start
+
+        np.testing.assert_allclose(sweep['f1'], f1_legacy, atol=1e-12)
+        assert THRESHOLDS[np.argmax(sweep['f1'])] == best_legacy
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            metrics = evaluate_predictions(y_true, y_prob, output_dir=out_dir, plots=True)
+        print(f"n={n:>6} legacy_sweep={t_legacy * 1e3:8.1f}ms vectorized_sweep={t_sweep * 1e3:6.2f}ms "
+              f"speedup={t_legacy / t_sweep:6.0f}x full_report_with_plots={metrics['eval_seconds'] * 1e3:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
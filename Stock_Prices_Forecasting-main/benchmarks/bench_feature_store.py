@@ -0,0 +1,65 @@
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_daily_sentiment, make_ohlcv
+from Pipeline.feature_store import TARGET_HORIZONS, FeatureStore, compute_features, target_frame
+from Pipeline.orchestrator import build_target_frames
+
+
+def main(n_rows=5000, n_slice=250, columns=('Close', 'RSI', 'EMAF', 'avg_sentiment', 'TargetClass')):
+    data = make_ohlcv(n_rows)
+    sentiment_df = make_daily_sentiment(n_days=n_rows * 2)
+
+    # Old way: every notebook/pipeline run rebuilds the frames it needs
+    start = time.perf_counter()
+    frames = build_target_frames(data, sentiment_df)
+    t_rebuild = time.perf_counter() - start
+
+    features = compute_features(data, sentiment_df)
+    for target_type in TARGET_HORIZONS:
+        expected, target_column, horizon = frames[target_type]
+        got, got_column, got_horizon = target_frame(features, target_type)
+        assert (got_column, got_horizon) == (target_column, horizon)
+        assert list(got.columns) == list(expected.columns), (target_type, list(got.columns))
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = f"{tmp_dir}/features.csv"
+        features.to_csv(csv_path, index=False)
+        store = FeatureStore(tmp_dir)
+        meta = store.write("^NDX", features, version="v1")
+
+        # The float32 round trip stays within float32 precision of the computed frame
+        stored = FeatureStore(tmp_dir).get_features("^NDX")
+        assert (stored['Date'] == features['Date']).all()
+        for column in meta['columns']:
+            np.testing.assert_allclose(stored[column], features[column], rtol=1e-6, equal_nan=True)
+
+        start_date, end_date = features['Date'].iloc[n_rows // 2], features['Date'].iloc[n_rows // 2 + n_slice - 1]
+        start = time.perf_counter()
+        sliced = pd.read_csv(csv_path, parse_dates=['Date'])
+        sliced = sliced.loc[sliced['Date'].between(start_date, end_date), ['Date', *columns]]
+        t_csv = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cold = FeatureStore(tmp_dir).get_features("^NDX", start_date, end_date, columns)
+        t_cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(100):
+            warm = store.get_features("^NDX", start_date, end_date, columns)
+        t_warm = (time.perf_counter() - start) / 100
+        assert len(cold) == len(warm) == len(sliced) == n_slice
+
+    mb_frame = features.memory_usage(deep=True).sum() / 2 ** 20
+    mb_store = (n_rows * 8 + n_rows * 4 * len(meta['columns'])) / 2 ** 20
+    print(f"rows={n_rows} columns={len(meta['columns'])} rebuild_frames={t_rebuild * 1e3:.1f}ms "
+          f"memory pandas={mb_frame:.2f}MiB float32_columns={mb_store:.2f}MiB")
+    print(f"slice rows={n_slice} columns={len(columns)} csv={t_csv * 1e3:.1f}ms "
+          f"store_cold={t_cold * 1e3:.2f}ms store_warm={t_warm * 1e3:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
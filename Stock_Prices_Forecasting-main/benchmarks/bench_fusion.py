@@ -0,0 +1,80 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+from Fusion_Model.fuse import FusionModel
+
+
+def make_days(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lstm_preds = 15000 + np.cumsum(rng.normal(0, 50, n))
+    sentiment = rng.uniform(-1, 1, n)
+    article_count = rng.integers(1, 80, n).astype(float)
+    true_prices = lstm_preds + 40 * sentiment + 0.5 * article_count + rng.normal(0, 20, n)
+    return lstm_preds, sentiment, article_count, true_prices
+
+
+def main(n_days=2000, n_predict=100000, decay=0.99):
+    lstm_preds, sentiment, article_count, true_prices = make_days(n_days)
+    X = np.column_stack([lstm_preds, sentiment, article_count])
+
+    # Batch fit matches LinearRegression, with and without extra features
+    reference = LinearRegression().fit(X[:, :2], true_prices)
+    model = FusionModel().train(lstm_preds, sentiment, true_prices)
+    np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-8)
+    np.testing.assert_allclose(model.intercept_, reference.intercept_, rtol=1e-8)
+    reference_extra = LinearRegression().fit(X, true_prices)
+    model_extra = FusionModel(['article_count']).train(lstm_preds, sentiment, true_prices, article_count=article_count)
+    np.testing.assert_allclose(model_extra.coef_, reference_extra.coef_, rtol=1e-8)
+
+    # Day-by-day updates end where a full refit does
+    online = FusionModel(['article_count'])
+    start = time.perf_counter()
+    for i in range(n_days):
+        online.update(lstm_preds[i], sentiment[i], true_prices[i], article_count=article_count[i])
+        online.coef_  # solved every day, as a daily job would
+    t_online = time.perf_counter() - start
+    np.testing.assert_allclose(online.coef_, model_extra.coef_, rtol=1e-7)
+
+    start = time.perf_counter()
+    for i in range(1, n_days + 1, max(n_days // 200, 1)):
+        LinearRegression().fit(X[:i], true_prices[:i])
+    t_refit = (time.perf_counter() - start) / len(range(1, n_days + 1, max(n_days // 200, 1))) * n_days
+
+    # Exponential forgetting equals a LinearRegression weighted by decay ** age
+    forgetful = FusionModel(decay=decay)
+    for chunk in np.array_split(np.arange(n_days), 7):
+        forgetful.update(lstm_preds[chunk], sentiment[chunk], true_prices[chunk])
+    weights = decay ** np.arange(n_days - 1, -1, -1)
+    weighted = LinearRegression().fit(X[:, :2], true_prices, sample_weight=weights)
+    np.testing.assert_allclose(forgetful.coef_, weighted.coef_, rtol=1e-6)
+
+    # Batched predict against the old one-pair-at-a-time call
+    rng = np.random.default_rng(1)
+    p, s = 15000 + rng.normal(0, 500, n_predict), rng.uniform(-1, 1, n_predict)
+    start = time.perf_counter()
+    batch = model.predict(p, s)
+    t_batch = time.perf_counter() - start
+    n_loop = min(n_predict, 2000)
+    start = time.perf_counter()
+    loop = [reference.predict([[a, b]])[0] for a, b in zip(p[:n_loop], s[:n_loop])]
+    t_loop = (time.perf_counter() - start) / n_loop * n_predict
+    np.testing.assert_allclose(batch[:n_loop], loop, rtol=1e-9)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "fusion.json")
+        online.save(path)
+        restored = FusionModel.load(path)
+        np.testing.assert_allclose(restored.coef_, online.coef_)
+
+    print(f"days={n_days} online_update+solve={t_online / n_days * 1e6:7.1f}us/day "
+          f"refit_per_day={t_refit / n_days * 1e6:9.1f}us/day (extrapolated)")
+    print(f"predict n={n_predict} batched={t_batch * 1e3:7.2f}ms per_pair_loop={t_loop * 1e3:9.0f}ms (extrapolated) "
+          f"speedup={t_loop / t_batch:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# What each CLI command imports before it does any work, measured with `python -X importtime`
+# in a fresh interpreter. Heavy modules listed as forbidden must never be pulled in; the time
+# budgets are generous wall-clock limits for a cold start on a laptop-class CPU.
+COMMAND_IMPORTS = {
+    'cli': ['cli'],
+    'fetch': ['cli', 'Pipeline.market_data'],
+    'features': ['cli', 'Pipeline.orchestrator', 'Pipeline.pipeline', 'Pipeline.market_data'],
+    'train': ['cli', 'Pipeline.orchestrator'],
+    'predict': ['cli', 'Pipeline.orchestrator', 'Pipeline.predict_service', 'Pipeline.pipeline'],
+    'news': ['cli', 'Fusion_Model.helpers'],
+}
+HEAVY_MODULES = ['tensorflow', 'keras', 'sklearn', 'matplotlib', 'yfinance', 'transformers', 'torch', 'spacy']
+BUDGET_SECONDS = {
+    'cli': 0.1,
+    'fetch': 1.0,
+    'features': 1.0,
+    'train': 1.0,
+    'predict': 1.5,
+    'news': 1.0,
+}
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(modules):
+    # Returns total cumulative seconds of the top-level imports and every module imported
+    statement = "; ".join(f"import {m}" for m in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True,
+                            cwd=os.getcwd(), check=True)
+    total, imported = 0, set()
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        imported.add(name)
+        if len(indent) == 1:
+            total += int(cumulative)
+    return total / 1e6, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold import time of each CLI command")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every budget, e.g. on slow CI")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = []
+    for command, modules in COMMAND_IMPORTS.items():
+        runs = [measure(modules) for _ in range(args.repeats)]
+        seconds = min(r[0] for r in runs)
+        imported = runs[0][1]
+        heavy = sorted(m for m in HEAVY_MODULES if m in imported)
+        budget = BUDGET_SECONDS[command] * args.budget_scale
+        status = "ok" if seconds <= budget and not heavy else "FAIL"
+        print(f"{command:>9} imports={seconds * 1e3:7.1f}ms budget={budget * 1e3:7.1f}ms "
+              f"modules={len(imported):4d} heavy={','.join(heavy) or '-'} {status}")
+        if status == "FAIL":
+            failures.append(command)
+
+    if failures:
+        print(f"[ERROR] Import budget exceeded for: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_ohlcv
+from Pipeline.indicators import EMA_LENGTHS, INDICATOR_COLUMNS, RSI_LENGTH, IndicatorEngine
+
+try:
+    import pandas_ta as ta
+except ImportError:
+    ta = None
+
+
+def check_against_pandas_ta(data, features):
+    if ta is None:
+        print("pandas_ta not installed, skipping reference comparison")
+        return
+    reference = {'RSI': ta.rsi(data.Close, length=RSI_LENGTH)}
+    for name, length in EMA_LENGTHS.items():
+        reference[name] = ta.ema(data.Close, length=length)
+    for name in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(features[name], reference[name], rtol=1e-8, equal_nan=True)
+    print("matches pandas_ta")
+
+
+def main(n_rows=5000, n_new=250):
+    data = make_ohlcv(n_rows)
+    history, new_bars = data.iloc[:-n_new], data.iloc[-n_new:]
+
+    full = IndicatorEngine().fit(data)
+    check_against_pandas_ta(data, full)
+
+    # Nightly refresh, old way: recompute everything once per new bar
+    start = time.perf_counter()
+    for i in range(n_new):
+        recomputed = IndicatorEngine().fit(data.iloc[:len(history) + i + 1])
+    t_full = time.perf_counter() - start
+
+    # New way: fit once, then stream the new bars through the saved state
+    engine = IndicatorEngine()
+    engine.fit(history)
+    engine = IndicatorEngine.from_state_dict(engine.state_dict())
+    start = time.perf_counter()
+    appended = engine.append(new_bars)
+    t_inc = time.perf_counter() - start
+
+    np.testing.assert_allclose(appended.to_numpy(), full.iloc[-n_new:].to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(recomputed.iloc[-1].to_numpy(), appended.iloc[-1].to_numpy(), rtol=1e-9)
+    print(f"history={len(history)} new_bars={n_new} "
+          f"full_recompute={t_full * 1e3:.1f}ms incremental={t_inc * 1e3:.2f}ms "
+          f"per_bar={t_inc / n_new * 1e6:.1f}us speedup={t_full / t_inc:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from Pipeline.bundle import load_bundle, save_bundle
+from Pipeline.numpy_inference import NumpyModel, export_layers
+from Pipeline.pipeline import FEATURE_COLUMNS, build_lstm_model, scale_dataset
+
+
+def best_time(fn, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def import_seconds(statement):
+    # Fresh interpreter per runtime so nothing is already imported
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True, cwd=os.getcwd(),
+                   env=dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3"))
+    return time.perf_counter() - start
+
+
+def main(backcandles=15, batch_sizes=(1, 256, 4096), seed=0):
+    rng = np.random.default_rng(seed)
+    model = build_lstm_model((backcandles, len(FEATURE_COLUMNS)))
+    X_raw = rng.normal(size=(max(batch_sizes), backcandles, len(FEATURE_COLUMNS))).astype(np.float32)
+    X, scaler = scale_dataset(X_raw)
+    X = X.astype(np.float32)
+
+    numpy_model = NumpyModel(*export_layers(model))
+    np.testing.assert_allclose(numpy_model.predict(X), model.predict(X, verbose=0), atol=1e-5)
+
+    for n in batch_sizes:
+        batch = X[:n]
+        t_keras = best_time(lambda: model.predict(batch, verbose=0))
+        t_call = best_time(lambda: model(batch, training=False))
+        t_numpy = best_time(lambda: numpy_model.predict(batch))
+        print(f"batch={n:>5} keras_predict={t_keras * 1e3:8.2f}ms keras_call={t_call * 1e3:8.2f}ms "
+              f"numpy={t_numpy * 1e3:8.2f}ms speedup_vs_predict={t_keras / t_numpy:6.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bundle.zip")
+        save_bundle(path, model, scaler, 0.5, FEATURE_COLUMNS, backcandles, sample=X[:64])
+        keras_bundle = load_bundle(path)
+        numpy_bundle = load_bundle(path, runtime="numpy")
+        np.testing.assert_allclose(numpy_bundle.predict_proba(X_raw[:256]), keras_bundle.predict_proba(X_raw[:256]),
+                                   atol=1e-5)
+
+        load = f"from Pipeline.bundle import load_bundle; load_bundle({path!r}, runtime="
+        t_keras_cold = import_seconds(load + "'keras')")
+        t_numpy_cold = import_seconds(load + "'numpy')")
+    print(f"cold start (interpreter + imports + load bundle): keras={t_keras_cold:.2f}s numpy={t_numpy_cold:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import make_feature_frame
+from Pipeline.pipeline import prepare_dataset, scale_dataset
+from Pipeline.streaming import make_dataset, write_shards
+
+
+def peak_bytes(fn):
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def main(n_tickers=4, n_rows=5000, backcandles=15, batch_size=32):
+    frames = {f"T{i}": (make_feature_frame(n_rows, seed=i), 'TargetClass', 1) for i in range(n_tickers)}
+
+    with tempfile.TemporaryDirectory() as shard_dir:
+        shards = write_shards(frames, shard_dir, backcandles=backcandles, min_date='1900-01-01')
+        samples = shards.samples()
+
+        # Windows and labels match prepare_dataset shard by shard
+        dense = [prepare_dataset(d, t, backcandles, h, materialize=True, min_date='1900-01-01') for d, t, h in frames.values()]
+        X_dense = np.concatenate([X for X, _, _ in dense])
+        y_dense = np.concatenate([y for _, y, _ in dense])
+        X_stream, y_stream = shards.windows(samples)
+        np.testing.assert_array_equal(X_stream, X_dense)
+        np.testing.assert_array_equal(y_stream, y_dense)
+
+        # The row-weighted scaler reproduces scale_dataset's statistics over all windows
+        _, dense_scaler = scale_dataset(X_dense.astype(np.float64))
+        scaler = shards.fit_scaler(samples)
+        np.testing.assert_allclose(scaler.mean_, dense_scaler.mean_, rtol=1e-6)
+        np.testing.assert_allclose(scaler.scale_, dense_scaler.scale_, rtol=1e-5)
+
+        _, dense_peak = peak_bytes(lambda: scale_dataset(np.concatenate(
+            [prepare_dataset(d, t, backcandles, h, materialize=True, min_date='1900-01-01')[0] for d, t, h in frames.values()])))
+        _, batch_peak = peak_bytes(lambda: shards.windows(samples[:batch_size]))
+
+        dataset = make_dataset(shards, samples, scaler, batch_size)
+        start = time.perf_counter()
+        n_batches = sum(1 for _ in dataset)
+        t_epoch = time.perf_counter() - start
+
+    print(f"tickers={n_tickers} samples={len(samples)} dense_X_peak={dense_peak / 2**20:.1f}MiB "
+          f"per_batch_peak={batch_peak / 2**10:.1f}KiB input_epoch={t_epoch:.2f}s "
+          f"({len(samples) / t_epoch:,.0f} windows/s over {n_batches} batches)")
+
+
+if __name__ == "__main__":
+    main()
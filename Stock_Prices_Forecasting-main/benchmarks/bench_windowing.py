@@ -0,0 +1,42 @@
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_feature_frame
+from Pipeline.pipeline import FEATURE_COLUMNS
+from Pipeline.windowing import build_windows
+
+
+def legacy_windows(data, feature_columns, backcandles=15):
+    # The original prepare_dataset loop, kept here as the reference implementation
+    X = []
+    for j in range(len(feature_columns)):
+        X.append([data[feature_columns].iloc[i-backcandles:i, j].values for i in range(backcandles, len(data))])
+    X = np.moveaxis(X, [0], [2])
+    return np.array(X)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(sizes=(250, 1000, 2500), backcandles=15):
+    for n_rows in sizes:
+        data = make_feature_frame(n_rows)
+        legacy, t_legacy = timed(legacy_windows, data, FEATURE_COLUMNS, backcandles)
+        view, t_view = timed(build_windows, data, FEATURE_COLUMNS, backcandles)
+        dense, t_dense = timed(build_windows, data, FEATURE_COLUMNS, backcandles, materialize=True)
+
+        assert view.shape == legacy.shape, (view.shape, legacy.shape)
+        np.testing.assert_allclose(view, legacy, rtol=1e-6)
+        np.testing.assert_array_equal(view, dense)
+
+        print(f"rows={n_rows:>6} shape={view.shape} "
+              f"legacy={t_legacy * 1e3:9.1f}ms view={t_view * 1e3:7.2f}ms "
+              f"materialized={t_dense * 1e3:7.2f}ms speedup={t_legacy / t_view:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
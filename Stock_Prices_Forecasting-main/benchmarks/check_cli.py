@@ -0,0 +1,28 @@
+from cli import build_parser, train_argv
+from Pipeline.orchestrator import build_parser as build_train_parser
+
+
+def parse_train(argv):
+    # What `python -m cli <argv>` hands to the orchestrator, parsed by the orchestrator
+    args, rest = build_parser().parse_known_args(argv)
+    assert args.command == "train", args.command
+    return build_train_parser().parse_args(train_argv(args, rest))
+
+
+def main():
+    train = parse_train(["--profile", "fit", "train", "^NDX"])
+    assert train.tickers == ["^NDX"] and train.profile == ["fit"], train
+
+    train = parse_train(["--profile", "fit", "--profile", "evaluate", "train", "^NDX", "AAPL", "--epochs", "3"])
+    assert train.tickers == ["^NDX", "AAPL"] and train.profile == ["fit", "evaluate"] and train.epochs == 3, train
+
+    train = parse_train(["train", "^NDX", "--profile", "*"])
+    assert train.tickers == ["^NDX"] and train.profile == ["*"], train
+
+    args, rest = build_parser().parse_known_args(["--profile", "fetch", "fetch", "^NDX"])
+    assert args.command == "fetch" and args.tickers == ["^NDX"] and args.profile == ["fetch"] and not rest
+    print("cli argument forwarding ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.synthetic import make_articles, make_daily_sentiment, make_tickers
+from Pipeline.profiling import REPORTS_DIR, peak_rss_mb
+
+# Offline, deterministic throughput and memory benchmarks of the hot paths. Every fixture is
+# synthetic (seeded), so results are comparable across commits on the same machine:
+#   python -m benchmarks.suite --scale medium --baseline reports/bench-<old>.json
+
+SCALES = {
+    'small': {'tickers': 2, 'rows': 1000, 'articles': 1000, 'fusion_rows': 1000, 'model_samples': 256},
+    'medium': {'tickers': 5, 'rows': 2500, 'articles': 5000, 'fusion_rows': 10000, 'model_samples': 1024},
+    'large': {'tickers': 20, 'rows': 5000, 'articles': 20000, 'fusion_rows': 100000, 'model_samples': 4096},
+}
+BACKCANDLES = 15
+MIN_DATE = '1900-01-01'
+
+
+def setup_prices(size):
+    from Pipeline.indicators import add_indicators
+
+    tickers = make_tickers(size['tickers'], size['rows'], seed=0)
+    sentiment_df = make_daily_sentiment(n_days=size['rows'] * 2, seed=0)
+    return {'raw': tickers, 'with_indicators': {t: add_indicators(d) for t, d in tickers.items()},
+            'sentiment': sentiment_df}
+
+
+def bench_indicators(ctx):
+    from Pipeline.indicators import add_indicators
+
+    for data in ctx['raw'].values():
+        add_indicators(data)
+    return sum(len(d) for d in ctx['raw'].values())
+
+
+def bench_engineer_features(ctx):
+    from Pipeline.orchestrator import TARGET_TYPES, build_target_frames
+
+    ctx['frames'] = {t: build_target_frames(d, ctx['sentiment'], TARGET_TYPES) for t, d in ctx['with_indicators'].items()}
+    return sum(len(d) for d in ctx['with_indicators'].values()) * len(TARGET_TYPES)
+
+
+def bench_prepare_dataset(ctx):
+    from Pipeline.pipeline import prepare_dataset
+
+    if 'frames' not in ctx:
+        bench_engineer_features(ctx)
+    n = 0
+    ctx['X'] = []
+    for frames in ctx['frames'].values():
+        for data, target_column, horizon in frames.values():
+            X, y, _ = prepare_dataset(data, target_column, BACKCANDLES, horizon, materialize=True, min_date=MIN_DATE)
+            ctx['X'].append(X)
+            n += len(y)
+    return n
+
+
+def bench_scale_dataset(ctx):
+    from Pipeline.pipeline import scale_dataset
+
+    if 'X' not in ctx:
+        bench_prepare_dataset(ctx)
+    for X in ctx['X']:
+        scale_dataset(X)
+    return sum(len(X) for X in ctx['X'])
+
+
+def setup_articles(size):
+    return {'articles': make_articles(size['articles'], n_days=30, seed=0)}
+
+
+def bench_is_relevant_news(ctx):
+    from Fusion_Model.news_filter import is_relevant_news
+
+    texts = (ctx['articles']['title'] + " " + ctx['articles']['description']).tolist()[:500]
+    for text in texts:
+        is_relevant_news(text)
+    return len(texts)
+
+
+def bench_filter_news(ctx):
+    from Fusion_Model.news_filter import filter_news
+
+    filter_news(ctx['articles'].copy())
+    return len(ctx['articles'])
+
+
+def bench_apply_sentiment(ctx):
+    from Fusion_Model.sentiment_analysis import apply_sentiment
+
+    news = ctx['articles'].copy()
+    news['combined_text'] = news['title'] + " " + news['description']
+    apply_sentiment(news, cache=False)
+    return len(news)
+
+
+def setup_fusion(size):
+    rng = np.random.default_rng(0)
+    n = size['fusion_rows']
+    lstm_preds = 15000 + np.cumsum(rng.normal(0, 50, n))
+    sentiment = rng.uniform(-1, 1, n)
+    true_prices = lstm_preds + 40 * sentiment + rng.normal(0, 20, n)
+    return {'lstm_preds': lstm_preds, 'sentiment': sentiment, 'true_prices': true_prices}
+
+
+def bench_fusion_train(ctx):
+    from Fusion_Model.fuse import FusionModel
+
+    ctx['fusion'] = FusionModel().train(ctx['lstm_preds'], ctx['sentiment'], ctx['true_prices'])
+    return len(ctx['true_prices'])
+
+
+def bench_fusion_update(ctx):
+    # One online update per trading day
+    from Fusion_Model.fuse import FusionModel
+
+    model = FusionModel()
+    n = min(len(ctx['true_prices']), 2000)
+    for p, s, y in zip(ctx['lstm_preds'][:n], ctx['sentiment'][:n], ctx['true_prices'][:n]):
+        model.update(p, s, y)
+    return n
+
+
+def bench_fusion_predict(ctx):
+    if 'fusion' not in ctx:
+        bench_fusion_train(ctx)
+    ctx['fusion'].predict(ctx['lstm_preds'], ctx['sentiment'])
+    return len(ctx['lstm_preds'])
+
+
+def setup_model(size):
+    from Pipeline.pipeline import FEATURE_COLUMNS
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(size['model_samples'], BACKCANDLES, len(FEATURE_COLUMNS))).astype(np.float32)
+    return {'X': X, 'y': rng.integers(0, 2, len(X))}
+
+
+def bench_model_fit(ctx):
+    from Pipeline.pipeline import build_lstm_model
+
+    ctx['model'] = build_lstm_model(ctx['X'].shape[1:])
+    ctx['model'].fit(ctx['X'], ctx['y'], epochs=1, batch_size=32, verbose=0)
+    return len(ctx['X'])
+
+
+def bench_model_predict(ctx):
+    if 'model' not in ctx:
+        bench_model_fit(ctx)
+    ctx['model'].predict(ctx['X'], verbose=0)
+    return len(ctx['X'])
+
+
+def bench_numpy_predict(ctx):
+    from Pipeline.numpy_inference import NumpyModel, export_layers
+
+    if 'model' not in ctx:
+        bench_model_fit(ctx)
+    if 'numpy_model' not in ctx:
+        ctx['numpy_model'] = NumpyModel(*export_layers(ctx['model']))
+    ctx['numpy_model'].predict(ctx['X'])
+    return len(ctx['X'])
+
+
+# name: (setup, run, unit); cases sharing a setup share one fixture, in this order
+CASES = {
+    'indicators': (setup_prices, bench_indicators, "rows"),
+    'engineer_features': (setup_prices, bench_engineer_features, "rows"),
+    'prepare_dataset': (setup_prices, bench_prepare_dataset, "samples"),
+    'scale_dataset': (setup_prices, bench_scale_dataset, "samples"),
+    'is_relevant_news': (setup_articles, bench_is_relevant_news, "articles"),
+    'filter_news': (setup_articles, bench_filter_news, "articles"),
+    'apply_sentiment': (setup_articles, bench_apply_sentiment, "articles"),
+    'fusion_train': (setup_fusion, bench_fusion_train, "rows"),
+    'fusion_update': (setup_fusion, bench_fusion_update, "days"),
+    'fusion_predict': (setup_fusion, bench_fusion_predict, "rows"),
+    'model_fit': (setup_model, bench_model_fit, "samples"),
+    'model_predict': (setup_model, bench_model_predict, "samples"),
+    'numpy_predict': (setup_model, bench_numpy_predict, "samples"),
+}
+
+
+def measure(run, ctx, repeats):
+    run(ctx)  # warm-up: lazy imports, caches, first-call tracing
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        items = run(ctx)
+        times.append(time.perf_counter() - start)
+    # One more pass under tracemalloc for the Python/NumPy allocation peak (it slows the run down)
+    tracemalloc.start()
+    run(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = min(times)
+    return {'items': items, 'best_seconds': best, 'median_seconds': float(np.median(times)),
+            'items_per_second': items / best if best > 0 else None, 'peak_alloc_mb': peak / 2 ** 20}
+
+
+def compare(results, baseline, tolerance):
+    # A case regresses when its throughput drops by more than `tolerance` of the baseline
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get('results', {}).get(name)
+        if not old or not old.get('items_per_second') or not result.get('items_per_second'):
+            continue
+        ratio = result['items_per_second'] / old['items_per_second']
+        result['vs_baseline'] = ratio
+        if ratio < 1 - tolerance:
+            regressions.append(f"{name} ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic throughput/memory benchmarks")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", help="Results JSON (default reports/bench-<scale>-<time>.json)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    size = SCALES[args.scale]
+    fixtures, results = {}, {}
+    for name in args.only or CASES:
+        setup, run, unit = CASES[name]
+        try:
+            if setup not in fixtures:
+                fixtures[setup] = setup(size)
+            rss_before = peak_rss_mb()
+            result = measure(run, fixtures[setup], args.repeats)
+        except ImportError as e:
+            print(f"[WARN] Skipping {name}: {e}")
+            continue
+        result.update(unit=unit, peak_rss_mb=peak_rss_mb(),
+                      rss_growth_mb=(peak_rss_mb() - rss_before) if rss_before is not None else None)
+        results[name] = result
+        print(f"{name:>18} {result['items']:>8} {unit:<8} best={result['best_seconds'] * 1e3:9.2f}ms "
+              f"{result['items_per_second']:>12,.0f} {unit}/s alloc_peak={result['peak_alloc_mb']:8.1f}MiB")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+    started = datetime.now()
+    path = args.out or os.path.join(REPORTS_DIR, f"bench-{args.scale}-{started:%Y%m%d-%H%M%S}.json")
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({'scale': args.scale, 'size': size, 'repeats': args.repeats,
+                   'started_at': started.isoformat(timespec="seconds"), 'python': sys.version.split()[0],
+                   'cpu_count': os.cpu_count(), 'results': results}, f, indent=2)
+    print(f"[INFO] Results written to {path}")
+
+    if regressions:
+        print(f"[ERROR] Throughput regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(n_rows=1000, start="2015-01-01", seed=0, start_price=10000.0):
+    # Geometric random walk on business days, shaped like a yf.download frame
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=n_rows, name="Date")
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n_rows)))
+    open_ = close * (1 + rng.normal(0, 0.004, n_rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, n_rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, n_rows)))
+    volume = rng.integers(2_000_000_000, 8_000_000_000, n_rows).astype(float)
+    return pd.DataFrame({"Close": close, "High": high, "Low": low, "Open": open_, "Volume": volume}, index=dates)
+
+
+def make_feature_frame(n_rows=1000, seed=0):
+    # Frame with every column prepare_dataset reads, without needing pandas_ta
+    rng = np.random.default_rng(seed)
+    data = make_ohlcv(n_rows, seed=seed).reset_index()
+    data["RSI"] = rng.uniform(20, 80, n_rows)
+    data["EMAF"] = data["Close"].ewm(span=20, adjust=False).mean()
+    data["EMAM"] = data["Close"].ewm(span=100, adjust=False).mean()
+    data["EMAS"] = data["Close"].ewm(span=150, adjust=False).mean()
+    data["avg_sentiment"] = rng.uniform(-1, 1, n_rows)
+    data["TargetClass"] = rng.integers(0, 2, n_rows)
+    return data
+
+
+HEADLINE_WORDS = (
+    "stocks shares market index rally slump earnings report quarter guidance rate rates "
+    "inflation bond yields oil gold dollar chip chips tech sector growth investors traders "
+    "outlook profit revenue forecast beats misses rises falls jumps slides record weak strong "
+    "company companies economy jobs data policy central bank china trade tariffs retail "
+    "consumer energy weather sports football election court merger deal"
+).split()
+NDX_NAMES = ["Apple", "Microsoft", "Amazon", "NVIDIA", "Tesla", "Meta", "Google", "NASDAQ", "Wall Street", "Fed"]
+
+
+def make_articles(n_articles=1000, start="2024-01-01", n_days=30, relevant_share=0.5, seed=0):
+    # NewsAPI-shaped articles; roughly `relevant_share` of them name an NDX keyword
+    rng = np.random.default_rng(seed)
+    words = np.array(HEADLINE_WORDS)
+    days = pd.date_range(start, periods=n_days, freq="D")
+    titles, descriptions = [], []
+    for _ in range(n_articles):
+        title = list(rng.choice(words, rng.integers(5, 12)))
+        if rng.random() < relevant_share:
+            title.insert(int(rng.integers(0, len(title))), str(rng.choice(NDX_NAMES)))
+        titles.append(" ".join(title).capitalize())
+        descriptions.append(" ".join(rng.choice(words, rng.integers(15, 40))))
+    return pd.DataFrame({
+        "publishedAt": days[rng.integers(0, n_days, n_articles)].date,
+        "title": titles,
+        "description": descriptions,
+        "content": descriptions,
+        "source": rng.choice(["Reuters", "Bloomberg", "CNBC", "MarketWatch"], n_articles),
+    })
+
+
+def make_tickers(n_tickers=5, n_rows=1000, start="2015-01-01", seed=0):
+    # Independent OHLCV walks keyed by ticker, e.g. for a FrameProvider
+    return {f"SYN{i}": make_ohlcv(n_rows, start=start, seed=seed + i, start_price=100.0 * (i + 1))
+            for i in range(n_tickers)}
+
+
+def make_daily_sentiment(start="2015-01-01", n_days=2000, seed=0):
+    # Calendar-day aggregates in the load_sentiment layout
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Date": pd.date_range(start, periods=n_days, freq="D"),
+        "avg_sentiment": rng.uniform(-1, 1, n_days),
+        "avg_score": rng.uniform(0.5, 1, n_days),
+        "article_count": rng.integers(1, 60, n_days),
+    })